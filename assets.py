@@ -0,0 +1,50 @@
+# === Static assets for the Streamlit app (no Streamlit calls) ===
+# Images are resized to their display width and encoded once per process,
+# and the fixed text of the informational pages is cleaned and joined into
+# fragments once, so a view of a content page only hands Streamlit prepared
+# bytes and strings. PIL is imported on the first image.
+import base64
+import functools
+import io
+import os
+import textwrap
+from collections import namedtuple
+
+from rba.profiling import profiled
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+PORTRAIT = "ARA-0925.jpg"
+PORTRAIT_WIDTH = 400
+# st.image re-encodes resized JPEGs at 90; WebP at 80 is about half the size
+JPEG_QUALITY = 90
+WEBP_QUALITY = 80
+
+# jpeg: bytes st.image passes through untouched (already at the display
+# width); webp_uri: a data URL st.image hands straight to the browser
+ImageAsset = namedtuple("ImageAsset", ["width", "height", "jpeg", "webp_uri"])
+
+
+@functools.lru_cache(maxsize=None)
+@profiled
+def image_asset(name, width):
+    from PIL import Image
+    with Image.open(os.path.join(ASSET_DIR, name)) as image:
+        image = image.convert("RGB")
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+    jpeg, webp = io.BytesIO(), io.BytesIO()
+    image.save(jpeg, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    image.save(webp, "WEBP", quality=WEBP_QUALITY, method=6)
+    return ImageAsset(image.width, image.height, jpeg.getvalue(),
+                      "data:image/webp;base64," + base64.b64encode(webp.getvalue()).decode())
+
+
+@functools.lru_cache(maxsize=None)
+def fragment(*blocks):
+    # Markdown/HTML blocks cleaned as st.markdown would and joined into one
+    # document, sent as one element instead of one per block
+    return "\n\n".join(textwrap.dedent(block).strip() for block in blocks)
+
+
+def preload():
+    image_asset(PORTRAIT, PORTRAIT_WIDTH)
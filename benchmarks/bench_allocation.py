@@ -0,0 +1,382 @@
+# === Benchmarks for the allocation and projection hot paths ===
+#
+#   python -m benchmarks.bench_allocation                  # full sweep
+#   python -m benchmarks.bench_allocation --quick          # small sizes only
+#   python -m benchmarks.bench_allocation --compare benchmarks/results/<commit>.json
+#
+# Every case runs headless on synthetic return panels and records the best
+# wall time of --repeat runs plus the peak traced allocation of one extra run.
+# Sweeps over assets, days, profiles or horizon also get a scaling exponent:
+# the slope of log time against log size over the three largest sizes, where
+# fixed per-call overhead no longer dominates. Frontier points are checked
+# against SLSQP on the same problem, and the run fails if SLSQP finds a lower
+# objective. Results are written as JSON, by default to
+# benchmarks/results/<commit>.json, so runs on different commits can be
+# compared with --compare.
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import scipy.cluster.hierarchy as sch  # noqa: E402
+
+import charts  # noqa: E402
+import rba  # noqa: E402
+
+ASSET_SIZES = [10, 50, 100, 500, 1000, 2000, 5000]
+# Beyond the dense correlation matrix, for approximate HRP only
+LARGE_ASSET_SIZES = [10_000, 20_000]
+DAY_SIZES = [252, 504, 1260, 2520, 5000]
+PROFILE_COUNTS = [1_000, 10_000, 100_000]
+HORIZONS = [10, 20, 40, 60]
+# HRP sweeps: jobs over 100-asset subsets, 3 windows and 4 linkage methods
+SWEEP_JOB_COUNTS = [12, 48, 192]
+FIXED_DAYS = 252
+FIXED_ASSETS = 500
+QUICK_MAX = {"assets": 500, "days": 1260, "profiles": 10_000, "years": 60, "jobs": 48}
+# Frontiers on spread-out means hold far more assets, up to this many
+SPREAD_MAX_ASSETS = 1000
+# SLSQP check: universe sizes, every FRONTIER_CHECK_STRIDE-th frontier point,
+# and the objective excess over SLSQP (relative to its size) that fails it
+FRONTIER_CHECK_ASSETS = [10, 50, 100]
+FRONTIER_CHECK_STRIDE = 10
+FRONTIER_CHECK_TOLERANCE = 1e-9
+# Sub-millisecond cases are mostly timer and interpreter noise
+MIN_FLAG_SECONDS = 1e-3
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def synthetic_panel(days, assets, seed=0):
+    # A shared market factor so the clustering sees real structure
+    rng = np.random.default_rng(seed)
+    market = rng.standard_normal((days, 1))
+    return (0.6 * market + rng.standard_normal((days, assets))) / 100
+
+
+def spread_panel(days, assets, seed=0):
+    # Independent assets whose mean returns differ by a tenth of their daily
+    # volatility, so long stretches of the frontier hold most of them
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal((days, assets)) + rng.normal(0, 0.1, assets)) / 100
+
+
+def synthetic_profiles(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "age": rng.integers(5, 100, count),
+        "horizon": rng.integers(1, 60, count),
+        "risk": rng.choice(rba.RISK_LEVELS, count),
+        "strategy": rng.choice(rba.STRATEGIES, count),
+    })
+
+
+def hrp_case(days, assets):
+    returns = synthetic_panel(days, assets)
+    universe = [f"A{i}" for i in range(assets)]
+    return lambda: rba.hrp_allocation(returns, universe=universe)
+
+
+def approximate_hrp_case(assets):
+    returns = synthetic_panel(FIXED_DAYS, assets)
+    universe = [f"A{i}" for i in range(assets)]
+    return lambda: rba.approximate_hrp_allocation(returns, universe=universe)
+
+
+def linkage_case(assets):
+    _, corr = rba.covariance_and_correlation(synthetic_panel(FIXED_DAYS, assets))
+    return lambda: rba.linkage_from_correlation(corr)
+
+
+def hrp_weights_case(assets):
+    cov, corr = rba.covariance_and_correlation(synthetic_panel(FIXED_DAYS, assets))
+    sorted_idx = sch.leaves_list(rba.linkage_from_correlation(corr))
+    return lambda: rba.hrp_weights(cov, sorted_idx)
+
+
+def covariance_case(days, shrinkage=None):
+    returns = synthetic_panel(days, FIXED_ASSETS)
+    return lambda: rba.estimate_covariance(returns, shrinkage)
+
+
+def frontier_case(assets, panel=synthetic_panel):
+    returns = panel(FIXED_DAYS, assets)
+    universe = [f"A{i}" for i in range(assets)]
+    return lambda: rba.efficient_frontier(returns, universe=universe)
+
+
+def cluster_variance_case(assets):
+    # The deepest bisection level, pairs of adjacent assets covering the
+    # whole quasi-diagonal, which is the widest call hrp_weights makes
+    cov, _ = rba.covariance_and_correlation(synthetic_panel(FIXED_DAYS, assets))
+    prefix = np.zeros((assets, assets + 1))
+    np.cumsum(cov, axis=1, out=prefix[:, 1:])
+    bounds = np.arange(0, assets + 1, 2)
+    starts, stops = bounds[:-1], bounds[1:]
+    return lambda: rba.get_cluster_variance(prefix, starts, stops)
+
+
+def batch_case(profiles):
+    frame = synthetic_profiles(profiles)
+    returns = synthetic_panel(FIXED_DAYS, len(rba.STOCKS))
+    return lambda: rba.batch_allocate(frame, returns)
+
+
+def rebalancing_case(profiles):
+    weights, _ = rba.batch_allocate(synthetic_profiles(profiles), synthetic_panel(FIXED_DAYS, len(rba.STOCKS)))
+    returns = synthetic_panel(FIXED_DAYS, len(rba.STOCKS), seed=1)
+    return lambda: rba.simulate_rebalancing(weights, returns, "band")
+
+
+def risk_case(profiles):
+    weights, _ = rba.batch_allocate(synthetic_profiles(profiles), synthetic_panel(FIXED_DAYS, len(rba.STOCKS)))
+    returns = synthetic_panel(FIXED_DAYS, len(rba.STOCKS), seed=1)
+    return lambda: rba.risk_metrics(weights, returns)
+
+
+def stress_case(profiles, scenarios=500):
+    weights, _ = rba.batch_allocate(synthetic_profiles(profiles), synthetic_panel(FIXED_DAYS, len(rba.STOCKS)))
+    library = rba.scenario_library(synthetic_panel(scenarios + 20, len(rba.STOCKS), seed=1), hypothetical=False)
+    return lambda: rba.stress_test(weights, library.shocks, library.names)
+
+
+def sweep_case(jobs, workers):
+    # Random 100-asset universes of a 5-year, 500-asset panel, each over the
+    # last year, the last two and the first year; pool start-up is included
+    returns = synthetic_panel(5 * FIXED_DAYS, FIXED_ASSETS)
+    tickers = [f"A{i}" for i in range(FIXED_ASSETS)]
+    rng = np.random.default_rng(0)
+    universes = {f"U{k}": rng.choice(tickers, 100, replace=False).tolist() for k in range(jobs // 12)}
+    windows = {"1y": (None, None, FIXED_DAYS), "2y": (None, None, 2 * FIXED_DAYS), "first": (0, FIXED_DAYS, None)}
+    grid = rba.sweep_grid(universes, windows)
+    return lambda: rba.hrp_sweep(grid, returns, tickers, workers=workers)
+
+
+def projection_case(years):
+    returns = synthetic_panel(FIXED_DAYS, len(rba.STOCKS))
+    weights = rba.basic_allocation("Medium").values
+    return lambda: rba.growth_projection(weights, returns, 10000, years, 30000)
+
+
+def plot_growth_case(years):
+    returns = synthetic_panel(FIXED_DAYS, len(rba.STOCKS))
+    weights = rba.basic_allocation("Medium").values
+    bands, _ = rba.growth_projection(weights, returns, 10000, years, 30000)
+    expected = rba.expected_return(weights, returns)
+
+    def render():
+        fig = charts.growth_figure(10000, expected, years, bands)
+        fig.savefig(io.BytesIO(), format="png")
+        plt.close(fig)
+    return render
+
+
+def cases(quick):
+    # (case, swept parameter, value, fixed parameters, setup returning the callable)
+    def keep(param, value):
+        return not quick or value <= QUICK_MAX[param]
+
+    for assets in ASSET_SIZES:
+        if keep("assets", assets):
+            yield "hrp_allocation", "assets", assets, {"days": FIXED_DAYS}, lambda a=assets: hrp_case(FIXED_DAYS, a)
+            yield "linkage", "assets", assets, {"days": FIXED_DAYS}, lambda a=assets: linkage_case(a)
+            yield "hrp_weights", "assets", assets, {"days": FIXED_DAYS}, lambda a=assets: hrp_weights_case(a)
+            yield "get_cluster_variance", "assets", assets, {"days": FIXED_DAYS}, lambda a=assets: cluster_variance_case(a)
+            yield "efficient_frontier", "assets", assets, {"days": FIXED_DAYS, "points": rba.FRONTIER_POINTS}, lambda a=assets: frontier_case(a)
+        if keep("assets", assets) and assets <= SPREAD_MAX_ASSETS:
+            yield "efficient_frontier_spread", "assets", assets, {"days": FIXED_DAYS, "points": rba.FRONTIER_POINTS}, lambda a=assets: frontier_case(a, spread_panel)
+    for assets in ASSET_SIZES + LARGE_ASSET_SIZES:
+        if keep("assets", assets):
+            yield "approximate_hrp", "assets", assets, {"days": FIXED_DAYS, "neighbours": rba.HRP_NEIGHBOURS}, lambda a=assets: approximate_hrp_case(a)
+    for days in DAY_SIZES:
+        if keep("days", days):
+            yield "hrp_allocation", "days", days, {"assets": FIXED_ASSETS}, lambda d=days: hrp_case(d, FIXED_ASSETS)
+            yield "estimate_covariance", "days", days, {"assets": FIXED_ASSETS}, lambda d=days: covariance_case(d)
+            yield "ledoit_wolf", "days", days, {"assets": FIXED_ASSETS}, lambda d=days: covariance_case(d, "ledoit-wolf")
+    yield "basic_allocation", None, None, {}, lambda: (lambda: rba.basic_allocation("Medium"))
+    for profiles in PROFILE_COUNTS:
+        if keep("profiles", profiles):
+            yield "batch_allocate", "profiles", profiles, {}, lambda p=profiles: batch_case(p)
+            yield "simulate_rebalancing", "profiles", profiles, {"days": FIXED_DAYS}, lambda p=profiles: rebalancing_case(p)
+            yield "risk_metrics", "profiles", profiles, {"days": FIXED_DAYS, "bootstrap": rba.risk.BOOTSTRAP_SAMPLES}, lambda p=profiles: risk_case(p)
+            yield "stress_test", "profiles", profiles, {"scenarios": 500}, lambda p=profiles: stress_case(p)
+    for jobs in SWEEP_JOB_COUNTS:
+        if keep("jobs", jobs):
+            yield "hrp_sweep", "jobs", jobs, {"workers": rba.JOB_WORKERS}, lambda j=jobs: sweep_case(j, rba.JOB_WORKERS)
+            yield "hrp_sweep_serial", "jobs", jobs, {"workers": 0}, lambda j=jobs: sweep_case(j, 0)
+    for years in HORIZONS:
+        if keep("years", years):
+            yield "growth_projection", "years", years, {"paths": rba.projection.PROJECTION_PATHS}, lambda y=years: projection_case(y)
+            yield "plot_growth", "years", years, {}, lambda y=years: plot_growth_case(y)
+
+
+def approximation_errors(quick):
+    # Approximate against exact HRP wherever the exact one still fits
+    rows = []
+    for assets in ASSET_SIZES:
+        if not quick or assets <= QUICK_MAX["assets"]:
+            error = rba.hrp_approximation_error(synthetic_panel(FIXED_DAYS, assets))
+            rows.append({"assets": assets, **{name: float(value) for name, value in error.items()}})
+    return rows
+
+
+def frontier_errors():
+    # Every FRONTIER_CHECK_STRIDE-th frontier point against SLSQP from an
+    # equal-weight start on the same objective. SLSQP can stop a little off
+    # the budget, so its answer is rescaled onto it before comparing; a
+    # positive gap means the frontier missed the optimum.
+    from scipy.optimize import minimize
+
+    rows = []
+    for assets in FRONTIER_CHECK_ASSETS:
+        returns = spread_panel(FIXED_DAYS, assets)
+        frontier = rba.efficient_frontier(returns, universe=range(assets))
+        cov, mean = np.cov(returns, rowvar=False), np.mean(returns, axis=0)
+        scale = np.trace(cov) / assets
+        budget = {"type": "eq", "fun": lambda x: x.sum() - 1, "jac": np.ones_like}
+        gaps, differences = [], []
+        for t, w in zip(frontier.risk_tolerance.values[::FRONTIER_CHECK_STRIDE],
+                        frontier.weights.values[::FRONTIER_CHECK_STRIDE]):
+            def objective(x, t=t):
+                return (0.5 * x @ cov @ x - t * mean @ x) / scale
+
+            def gradient(x, t=t):
+                return (cov @ x - t * mean) / scale
+            x = minimize(objective, np.full(assets, 1 / assets), jac=gradient, method="SLSQP",
+                         bounds=[(0, 1)] * assets, constraints=[budget],
+                         options={"ftol": 1e-15, "maxiter": 1000}).x
+            x /= x.sum()
+            gaps.append((objective(w) - objective(x)) / max(1, abs(objective(x))))
+            differences.append(np.abs(w - x).max())
+        rows.append({"assets": assets, "Objective Gap": float(max(gaps)),
+                     "Max Weight Difference": float(max(differences))})
+    return rows
+
+
+def measure(fn, repeat):
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def scaling_exponents(results):
+    sweeps = {}
+    for r in results:
+        if r["param"] is not None:
+            sweeps.setdefault((r["case"], r["param"]), []).append((r["value"], r["seconds"]))
+    exponents = []
+    for (case, param), points in sweeps.items():
+        if len(points) >= 3:
+            x, y = np.log(np.array(sorted(points)[-3:], dtype=float)).T
+            exponents.append({"case": case, "param": param, "exponent": round(float(np.polyfit(x, y, 1)[0]), 3)})
+    return exponents
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline_path, threshold):
+    with open(baseline_path) as f:
+        baseline = {(r["case"], r["param"], r["value"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nAgainst {baseline_path} (flagging > {threshold:.2f}x):")
+    for r in results:
+        old = baseline.get((r["case"], r["param"], r["value"]))
+        if old is None:
+            continue
+        ratio = r["seconds"] / old["seconds"]
+        flag = "  REGRESSION" if ratio > threshold and r["seconds"] > MIN_FLAG_SECONDS else ""
+        regressions += bool(flag)
+        print(f"  {r['case']:<22} {r['param'] or '':<9} {r['value'] or '':>7}  {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the allocation and projection hot paths.")
+    parser.add_argument("--quick", action="store_true", help="skip the largest sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (best is kept)")
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="baseline JSON to compare wall times against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'case':<22} {'param':<9} {'value':>7} {'seconds':>10} {'peak MB':>9}")
+    for case, param, value, fixed, setup in cases(args.quick):
+        seconds, peak = measure(setup(), args.repeat)
+        results.append({"case": case, "param": param, "value": value, "fixed": fixed,
+                        "seconds": seconds, "peak_bytes": peak})
+        print(f"{case:<22} {param or '':<9} {value or '':>7} {seconds:10.5f} {peak / 2**20:9.1f}", flush=True)
+
+    exponents = scaling_exponents(results)
+    print("\nScaling exponents (time ~ size^k):")
+    for e in exponents:
+        print(f"  {e['case']:<22} {e['param']:<9} k = {e['exponent']:.2f}")
+
+    errors = approximation_errors(args.quick)
+    print("\nApproximate vs exact HRP weights:")
+    print(f"  {'assets':>7} {'max diff':>10} {'max rel':>9} {'turnover':>10} {'TE':>10}")
+    for e in errors:
+        print(f"  {e['assets']:>7} {e['Max Weight Difference']:10.2e} {e['Max Relative Difference']:9.2%} "
+              f"{e['Turnover']:10.2e} {e['Tracking Error']:10.2e}")
+
+    frontier = frontier_errors()
+    print("\nEfficient frontier vs SLSQP:")
+    print(f"  {'assets':>7} {'objective gap':>14} {'max diff':>10}")
+    for e in frontier:
+        flag = "  MISMATCH" if e["Objective Gap"] > FRONTIER_CHECK_TOLERANCE else ""
+        print(f"  {e['assets']:>7} {e['Objective Gap']:14.2e} {e['Max Weight Difference']:10.2e}{flag}")
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quick": args.quick,
+            "repeat": args.repeat,
+            "results": results,
+            "scaling": exponents,
+            "hrp_approximation": errors,
+            "frontier_check": frontier,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if any(e["Objective Gap"] > FRONTIER_CHECK_TOLERANCE for e in frontier):
+        sys.exit(1)
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# === Benchmarks for the advisor tabs' charts: payload size and render time ===
+#
+#   python -m benchmarks.bench_charts              # chart builders and full tab reruns
+#   python -m benchmarks.bench_charts --no-app     # chart builders only
+#
+# For each advisor tab, the "classic" charts (a Plotly pie figure serialized
+# to JSON and a matplotlib growth chart rendered to PNG the way st.pyplot
+# does) against the "native" Vega-Lite specs: the bytes each sends to the
+# browser and the best wall time of --repeat builds. Native specs are cached
+# by the app, so a warm rerun only pays the lookup; the app section times
+# whole reruns of each tab under RBA_CHARTS=classic and native with
+# Streamlit's AppTest. A last case shows the downsampling of a full set of
+# simulated paths. Results go to benchmarks/results/charts-<commit>.json.
+import argparse
+import io
+import json
+import os
+import platform
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import plotly.io as pio  # noqa: E402
+
+import charts  # noqa: E402
+import rba  # noqa: E402
+from benchmarks.bench_allocation import RESULTS_DIR, git_commit  # noqa: E402
+
+# (tab, page slug, initial investment, years), as the advisor pages call them
+TABS = [
+    ("Human", "human-advisor", 100_000, 30),
+    ("Robo", "robo-advisor", 10_000, 20),
+    ("Bionic", "bionic-advisor", 10_000, 20),
+]
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rbauzbek.py")
+
+
+def tab_inputs(tab, returns, initial_investment, years):
+    weights = {"Human": lambda: rba.basic_allocation("Medium"),
+               "Robo": lambda: rba.hrp_allocation(returns),
+               "Bionic": lambda: rba.bionic_allocation(35, years)}[tab]()
+    expected_return = float(weights.values @ np.mean(returns, axis=0) * 252)
+    bands, _ = rba.growth_projection(weights.values, returns, initial_investment, years, 2 * initial_investment)
+    return weights, expected_return, bands
+
+
+def classic_pie(weights, title):
+    return pio.to_json(charts.portfolio_pie_figure(weights, title), validate=False).encode()
+
+
+def classic_growth(initial_investment, expected_return, years, bands):
+    figure = charts.growth_figure(initial_investment, expected_return, years, bands)
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+    plt.close(figure)
+    return buffer.getvalue()
+
+
+def native(builder, *args, **kwargs):
+    return json.dumps(builder(*args, **kwargs)).encode()
+
+
+def measure(fn, repeat):
+    payload = fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times), len(payload)
+
+
+def chart_results(returns, repeat):
+    results = []
+    for tab, _, initial_investment, years in TABS:
+        weights, expected_return, bands = tab_inputs(tab, returns, initial_investment, years)
+        title = f"{tab} Advisor Portfolio"
+        for mode, chart, fn in [
+            ("classic", "pie", lambda: classic_pie(weights, title)),
+            ("classic", "growth", lambda: classic_growth(initial_investment, expected_return, years, bands)),
+            ("native", "pie", lambda: native(charts.portfolio_pie_spec, weights, title)),
+            ("native", "growth", lambda: native(charts.growth_chart_spec, initial_investment, expected_return,
+                                                years, bands)),
+        ]:
+            seconds, size = measure(fn, repeat)
+            results.append({"tab": tab, "mode": mode, "chart": chart, "seconds": seconds, "bytes": size})
+    return results
+
+
+def paths_result(returns, repeat):
+    # Every simulated path against the GROWTH_MAX_PATHS kept by the spec
+    weights = rba.basic_allocation("Medium").values
+    paths = rba.simulate_growth(weights, returns, 10_000, 20)
+    full = {"values": paths.T.tolist()}
+    seconds, size = measure(lambda: native(charts.growth_chart_spec, 10_000, 0.07, 20, paths=paths), repeat)
+    return {"paths": paths.shape[1], "kept": charts.GROWTH_MAX_PATHS, "seconds": seconds, "bytes": size,
+            "full_bytes": len(json.dumps(full).encode())}
+
+
+def app_results(repeat):
+    # Wall time of a whole rerun of each tab, after one run to warm the
+    # process-wide caches, as a session rerunning on an interaction would
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+    for mode in ["classic", "native"]:
+        os.environ["RBA_CHARTS"] = mode
+        app = AppTest.from_file(APP_PATH, default_timeout=300)
+        app.run()
+        for tab, slug, _, _ in TABS:
+            os.environ["RBA_START_PAGE"] = slug
+            app.run()
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                app.run()
+                times.append(time.perf_counter() - start)
+            if app.exception:
+                raise RuntimeError(f"{tab} tab failed under {mode}: {app.exception[0].message}")
+            results.append({"tab": tab, "mode": mode, "seconds": min(times)})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the advisor tabs' charts.")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case (best is kept)")
+    parser.add_argument("--no-app", action="store_true", help="skip the full tab reruns")
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/charts-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    _, _, returns = rba.load_returns(None, rba.LOOKBACK_DAYS)
+    results = chart_results(returns, args.repeat)
+    print(f"{'tab':<8} {'chart':<7} {'classic ms':>11} {'classic KB':>11} {'native ms':>10} {'native KB':>10}")
+    for tab, _, _, _ in TABS:
+        for chart in ["pie", "growth"]:
+            row = {r["mode"]: r for r in results if r["tab"] == tab and r["chart"] == chart}
+            print(f"{tab:<8} {chart:<7} {row['classic']['seconds'] * 1e3:11.1f} {row['classic']['bytes'] / 1024:11.1f}"
+                  f" {row['native']['seconds'] * 1e3:10.1f} {row['native']['bytes'] / 1024:10.1f}")
+
+    paths = paths_result(returns, args.repeat)
+    print(f"\n{paths['paths']:,} simulated paths: {paths['full_bytes'] / 2**20:.1f} MB as JSON, "
+          f"{paths['bytes'] / 1024:.1f} KB in the spec with {paths['kept']} kept ({paths['seconds'] * 1e3:.1f} ms)")
+
+    reruns = [] if args.no_app else app_results(args.repeat)
+    if reruns:
+        print(f"\n{'tab':<8} {'classic rerun ms':>17} {'native rerun ms':>16}")
+        for tab, _, _, _ in TABS:
+            row = {r["mode"]: r["seconds"] for r in reruns if r["tab"] == tab}
+            print(f"{tab:<8} {row['classic'] * 1e3:17.1f} {row['native'] * 1e3:16.1f}")
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"charts-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "repeat": args.repeat,
+            "charts": results,
+            "paths": paths,
+            "reruns": reruns,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# === Benchmarks for the server cost of a view of each content page ===
+#
+#   python -m benchmarks.bench_pages                 # 50 views per page
+#   python -m benchmarks.bench_pages --views 200
+#
+# Runs the app with Streamlit's AppTest and reads the script thread's own
+# timing from rba's traces (AppTest's polling is left out): the whole rerun
+# and the page body, as medians over --views reruns after a first view has
+# filled the per-process caches. Results go to
+# benchmarks/results/pages-<commit>.json.
+import argparse
+import json
+import os
+import platform
+import time
+
+import numpy as np
+
+from benchmarks.bench_allocation import RESULTS_DIR, git_commit
+from benchmarks.bench_charts import APP_PATH
+
+CONTENT_PAGES = ["about-me", "what-is-robo-advisor", "roots-of-robo-advisor", "how-it-works",
+                 "who-uses-robo-advisor", "conclusion", "group-activities"]
+
+
+def page_results(views, pages=CONTENT_PAGES):
+    from streamlit.testing.v1 import AppTest
+    from rba.profiling import _recent
+
+    app = AppTest.from_file(APP_PATH, default_timeout=120)
+    app.run()
+    results = []
+    for page in pages:
+        os.environ["RBA_START_PAGE"] = page
+        app.run()
+        traces = []
+        for _ in range(views):
+            app.run()
+            traces.append(_recent[-1])
+        if app.exception:
+            raise RuntimeError(f"{page} failed: {app.exception[0].message}")
+        spans = {}
+        for trace in traces:
+            for name, _, _, duration in trace.spans:
+                if name == f"page:{page}" or name.startswith("st."):
+                    spans.setdefault(name, []).append(duration)
+        results.append({
+            "page": page,
+            "elements": len(app.main),
+            "rerun_ms": float(np.median([trace.total for trace in traces]) * 1e3),
+            "spans_ms": {name: float(np.median(durations) * 1e3) for name, durations in spans.items()},
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the server cost of a content page view.")
+    parser.add_argument("--views", type=int, default=50, help="reruns per page (the median is kept)")
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/pages-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    results = page_results(args.views)
+    print(f"{'page':<24} {'rerun ms':>9} {'page ms':>8}  other spans")
+    for r in results:
+        spans = dict(r["spans_ms"])
+        page = spans.pop(f"page:{r['page']}")
+        other = ", ".join(f"{name} {ms:.2f}" for name, ms in spans.items())
+        print(f"{r['page']:<24} {r['rerun_ms']:9.2f} {page:8.2f}  {other}")
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"pages-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "images": os.environ.get("RBA_IMAGES", "webp"),
+            "views": args.views,
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
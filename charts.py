@@ -0,0 +1,162 @@
+# === Chart builders for the Streamlit app (no Streamlit calls) ===
+# Vega-Lite specs (plain dicts the browser draws) for the native charts, and
+# Plotly and matplotlib figures for the classic ones; Plotly and matplotlib
+# are imported on the first classic chart rather than at start-up
+from rba.profiling import profiled
+
+PASTEL_COLORS = ["#A2C4C9", "#C9DAF8", "#D9EAD3", "#F9CB9C", "#FFE599",
+                 "#B6D7A8", "#CFE2F3", "#EAD1DC", "#F6B26B", "#B4A7D6"]
+# Beyond these, the growth spec thins its years and sample paths evenly
+GROWTH_MAX_POINTS = 120
+GROWTH_MAX_PATHS = 50
+GROWTH_SERIES = ["5th–95th percentile", "25th–75th percentile", "Median path", "Expected return"]
+GROWTH_COLORS = ["#CFE2F3", "#9FC5E8", "#3D85C6", "#1F77B4"]
+
+
+@profiled
+def portfolio_pie_figure(weights, title):
+    import plotly.express as px
+    fig = px.pie(
+        names=weights.index,
+        values=weights * 100,
+        hole=0.45,
+        color_discrete_sequence=PASTEL_COLORS
+    )
+    fig.update_traces(
+        textinfo='label+percent',
+        textposition='inside',
+        insidetextorientation='radial',
+        pull=[0.02]*len(weights)
+    )
+    fig.update_layout(
+        height=600, width=600,
+        showlegend=False,
+        title_text=title,
+        title_x=0.5,
+        margin=dict(t=40, b=40, l=40, r=40)
+    )
+    return fig
+
+
+@profiled
+def growth_figure(initial_investment, expected_return, years, bands=None):
+    import matplotlib.pyplot as plt
+    values = [initial_investment * (1 + expected_return) ** year for year in range(years + 1)]
+    max_val = max(values)
+    fig, ax = plt.subplots(figsize=(7,5))
+    if bands is not None:
+        ax.fill_between(bands.index, bands["P5"], bands["P95"], color="#CFE2F3", label="5th–95th percentile")
+        ax.fill_between(bands.index, bands["P25"], bands["P75"], color="#9FC5E8", label="25th–75th percentile")
+        ax.plot(bands.index, bands["P50"], color="#3D85C6", label="Median path")
+    ax.plot(range(years + 1), values, marker='o', label="Expected return")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Portfolio Value ($)")
+    ax.set_title("Projected Portfolio Growth")
+    ax.text(years-3, max_val * 0.95, f"Max: ${max_val:,.0f}", ha='center', va='bottom', fontsize=10, color='green')
+    if bands is not None:
+        ax.legend(loc="upper left")
+    return fig
+
+
+def downsample(n, max_points):
+    # Up to max_points evenly spaced positions out of n, keeping both ends
+    if n <= max_points:
+        return list(range(n))
+    return sorted({round(i * (n - 1) / (max_points - 1)) for i in range(max_points)})
+
+
+def ticker_label(name):
+    return name[name.rindex("(") + 1:-1] if name.endswith(")") and "(" in name else name
+
+
+@profiled
+def portfolio_pie_spec(weights, title):
+    # The donut of portfolio_pie_figure as a Vega-Lite spec; slices under 2%
+    # keep their colour but drop the label
+    rows = [{"stock": str(name), "label": f"{ticker_label(str(name))} {weight:.0%}", "weight": float(weight),
+             "order": i} for i, (name, weight) in enumerate(weights.items())]
+    return {
+        "title": {"text": title, "anchor": "middle"},
+        "width": 520, "height": 520,
+        "data": {"values": rows},
+        "encoding": {
+            "theta": {"field": "weight", "type": "quantitative", "stack": True},
+            "order": {"field": "order", "type": "ordinal"},
+            "color": {"field": "stock", "type": "nominal", "sort": None, "legend": None,
+                      "scale": {"range": PASTEL_COLORS}},
+            "tooltip": [{"field": "stock", "title": "Stock"},
+                        {"field": "weight", "title": "Weight", "format": ".1%"}],
+        },
+        "layer": [
+            {"mark": {"type": "arc", "innerRadius": 117, "outerRadius": 260, "padAngle": 0.01}},
+            {"mark": {"type": "text", "radius": 190, "fontSize": 12},
+             "transform": [{"filter": "datum.weight >= 0.02"}],
+             "encoding": {"text": {"field": "label"}, "color": {"value": "#333333"}}},
+        ],
+    }
+
+
+@profiled
+def growth_chart_spec(initial_investment, expected_return, years, bands=None, paths=None,
+                      max_points=GROWTH_MAX_POINTS, max_paths=GROWTH_MAX_PATHS):
+    # growth_figure as a Vega-Lite spec the browser draws, with the same
+    # bands, median, expected-return line and "Max" note. paths, a (years + 1,
+    # n_paths) wealth array such as simulate_growth's, adds faint sample
+    # paths: max_paths of them, picked evenly by final value so the spread
+    # survives. Years beyond max_points are thinned before serializing.
+    keep = downsample(years + 1, max_points)
+    values = [initial_investment * (1 + expected_return) ** year for year in range(years + 1)]
+    rows = [{"year": year, "expected": float(values[year])} for year in keep]
+    if bands is not None:
+        for row in rows:
+            row.update({column: float(bands[column].iloc[row["year"]]) for column in ["P5", "P25", "P50", "P75", "P95"]})
+
+    def series(label):
+        # Each layer names itself in a "series" field so all share one legend
+        return {"transform": [{"calculate": f"'{label}'", "as": "series"}],
+                "color": {"field": "series", "type": "nominal", "title": None,
+                          "scale": {"domain": GROWTH_SERIES, "range": GROWTH_COLORS},
+                          "legend": {"orient": "top-left"} if bands is not None else None}}
+
+    def layer(mark, label, **encoding):
+        labelled = series(label)
+        return {"mark": mark, "transform": labelled["transform"],
+                "encoding": {"x": x, **encoding, "color": labelled["color"]}}
+
+    x = {"field": "year", "type": "quantitative", "title": "Year"}
+    y_title = "Portfolio Value ($)"
+    layers = []
+    if bands is not None:
+        layers += [
+            layer("area", GROWTH_SERIES[0], y={"field": "P5", "type": "quantitative", "title": y_title},
+                  y2={"field": "P95"}),
+            layer("area", GROWTH_SERIES[1], y={"field": "P25", "type": "quantitative"}, y2={"field": "P75"}),
+            layer("line", GROWTH_SERIES[2], y={"field": "P50", "type": "quantitative"}),
+        ]
+    if paths is not None:
+        final_order = paths[-1].argsort()
+        picked = final_order[downsample(len(final_order), max_paths)]
+        path_rows = [{"year": year, "path": int(p), "value": float(paths[year, p])} for p in picked for year in keep]
+        layers.append({"data": {"values": path_rows},
+                       "mark": {"type": "line", "opacity": 0.15, "strokeWidth": 1, "color": "#666666"},
+                       "encoding": {"x": x, "y": {"field": "value", "type": "quantitative"},
+                                    "detail": {"field": "path", "type": "nominal"}}})
+    layers += [
+        layer({"type": "line", "point": True}, GROWTH_SERIES[3],
+              y={"field": "expected", "type": "quantitative", "title": y_title, "axis": {"format": "$,.0f"}}),
+        {"data": {"values": [{"year": max(years - 3, 0), "expected": float(max(values)),
+                              "note": f"Max: ${max(values):,.0f}"}]},
+         "mark": {"type": "text", "color": "green", "baseline": "bottom", "dy": -4},
+         "encoding": {"x": x, "y": {"field": "expected", "type": "quantitative"}, "text": {"field": "note"}}},
+    ]
+    return {
+        "title": {"text": "Projected Portfolio Growth", "anchor": "middle"},
+        "height": 380,
+        "data": {"values": rows},
+        "layer": layers,
+    }
+
+
+def preload():
+    import matplotlib.pyplot  # noqa: F401
+    import plotly.express  # noqa: F401
@@ -0,0 +1,94 @@
+# === Robo-advisor core: allocation, projection and data, no UI imports ===
+# Names resolve on first access (PEP 562), so `import rba` costs nothing and
+# a caller pays only for the submodules it touches: numpy with the data,
+# pandas with the first allocation, scipy with the first HRP or MVO call.
+import importlib
+
+_SUBMODULES = {
+    "rba.allocation": [
+        "BASIC_ALLOCATIONS",
+        "BIONIC_AGE_BREAKS",
+        "BIONIC_ALLOCATIONS",
+        "RISK_LEVELS",
+        "STRATEGIES",
+        "basic_allocation",
+        "batch_allocate",
+        "batch_allocate_file",
+        "bionic_allocation",
+        "expected_return",
+        "smart_bionic_strategy",
+    ],
+    "rba.cache": ["RESULT_CACHE_PATH", "ResultCache", "code_version", "persistent", "result_cache"],
+    "rba.covariance": [
+        "COVARIANCE_CHUNK_ROWS",
+        "CovarianceAccumulator",
+        "CovarianceEstimate",
+        "SHRINKAGE_METHODS",
+        "estimate_covariance",
+    ],
+    "rba.data": [
+        "LOOKBACK_DAYS",
+        "STOCKS",
+        "TICKERS",
+        "ReturnsStore",
+        "load_returns",
+        "open_returns_store",
+        "returns_fingerprint",
+        "synthetic_returns",
+        "window_rows",
+    ],
+    "rba.hrp": [
+        "HRP_NEIGHBOURS",
+        "LINKAGE_METHODS",
+        "BacktestResult",
+        "approximate_hrp_allocation",
+        "cluster_linkage",
+        "covariance_and_correlation",
+        "get_cluster_variance",
+        "hrp_allocation",
+        "hrp_approximation_error",
+        "hrp_backtest",
+        "hrp_weights",
+        "linkage_from_correlation",
+    ],
+    "rba.jobs": ["JOB_POOL", "JOB_WORKERS", "Job", "JobQueue", "job_key", "job_queue"],
+    "rba.lookup": ["AllocationTable", "allocation_table_path", "build_allocation_table", "load_allocation_table"],
+    "rba.mvo": ["FRONTIER_POINTS", "Frontier", "MeanVarianceSolver", "efficient_frontier", "mvo_allocation"],
+    "rba.profiling": ["finish_trace", "profiled", "span", "span_summary", "start_trace", "trace_frame"],
+    "rba.projection": ["PROJECTION_PERCENTILES", "growth_projection", "simulate_growth"],
+    "rba.rebalancing": ["REBALANCE_RULES", "RebalanceResult", "simulate_rebalancing"],
+    "rba.risk": ["RISK_CONFIDENCE", "RiskReport", "risk_metrics"],
+    "rba.stress": [
+        "HYPOTHETICAL_SCENARIOS",
+        "HYPOTHETICAL_TICKERS",
+        "Scenarios",
+        "StressResult",
+        "scenario_library",
+        "stress_test",
+    ],
+    "rba.sweep": ["SweepJob", "hrp_sweep", "sweep_grid"],
+}
+
+_EXPORTS = {name: module for module, names in _SUBMODULES.items() for name in names}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if f"rba.{name}" in _SUBMODULES:
+        return importlib.import_module(f"rba.{name}")
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return __all__
+
+
+def preload():
+    # Import everything now instead of on first use, e.g. to warm a worker
+    for module in _SUBMODULES:
+        importlib.import_module(module)
@@ -0,0 +1,166 @@
+# === Rule-based allocations, expected returns and bulk onboarding ===
+import numpy as np
+import pandas as pd
+
+from rba.data import STOCKS
+from rba.hrp import hrp_allocation
+from rba.profiling import profiled
+
+# Rule-based allocations as lookup tables: one row of percentages per risk
+# level (Human) and per age bucket (Bionic), in STOCKS order
+RISK_LEVELS = ["Low", "Medium", "High"]
+BASIC_ALLOCATIONS = np.array([
+    [13, 13, 13, 6, 7, 11, 13, 13, 11, 0],
+    [10, 10, 10, 10, 10, 10, 10, 10, 10, 10],
+    [6, 6, 8, 15, 18, 8, 7, 8, 8, 6],
+])
+BIONIC_AGE_BREAKS = [30, 50]
+BIONIC_ALLOCATIONS = np.array([
+    [15, 14, 13, 10, 10, 8, 6, 6, 9, 9],
+    [12, 12, 10, 8, 8, 10, 10, 10, 10, 10],
+    [10, 10, 8, 6, 6, 12, 14, 14, 10, 10],
+])
+
+
+def normalized(values):
+    # Stripped and lowercased labels from free text (uploads, JSON bodies);
+    # anything that is not a string becomes NaN and so matches nothing
+    values = values if isinstance(values, pd.Series) else pd.Series(np.atleast_1d(values))
+    return values.astype(object).str.strip().str.lower()
+
+
+def invalid_rows(values, bad, limit=10):
+    # "row 3: 'Hgh', row 7: nan" for the first `limit` bad rows
+    bad_values = values[bad]
+    listed = ", ".join(f"row {row}: {value!r}" for row, value in list(bad_values.items())[:limit])
+    return listed + (f" and {len(bad_values) - limit} more" if len(bad_values) > limit else "")
+
+
+def risk_level_index(risk):
+    # Case and surrounding whitespace are ignored; any other value raises
+    risk = risk if isinstance(risk, pd.Series) else pd.Series(np.atleast_1d(risk))
+    codes = pd.Index([level.lower() for level in RISK_LEVELS]).get_indexer(normalized(risk))
+    if (codes < 0).any():
+        raise ValueError(f"Unknown risk level ({invalid_rows(risk, codes < 0)}); expected one of {RISK_LEVELS}")
+    return codes
+
+
+def numeric_field(values, name):
+    # Numbers from free text; blanks, NaN and anything unparsable raise
+    # rather than falling into the last age bucket or a NaN growth multiple
+    values = values if isinstance(values, pd.Series) else pd.Series(np.atleast_1d(values))
+    numbers = pd.to_numeric(values, errors="coerce").astype(float)
+    bad = ~np.isfinite(numbers.to_numpy())
+    if bad.any():
+        raise ValueError(f"Invalid {name} ({invalid_rows(values, bad)})")
+    return numbers.to_numpy()
+
+
+def bionic_age_index(age):
+    return np.searchsorted(BIONIC_AGE_BREAKS, age, side="right")
+
+
+@profiled
+def basic_allocation(risk):
+    stocks_pct = BASIC_ALLOCATIONS[risk_level_index(risk)[0]]
+    stocks_pct = stocks_pct / stocks_pct.sum()
+    return pd.Series(stocks_pct, index=STOCKS)
+
+
+def smart_bionic_strategy(age, years):
+    return BIONIC_ALLOCATIONS[bionic_age_index(age)].tolist()
+
+
+@profiled
+def bionic_allocation(age, years):
+    bionic_weights_raw = smart_bionic_strategy(age, years)
+    return pd.Series(np.array(bionic_weights_raw) / sum(bionic_weights_raw), index=STOCKS)
+
+
+def expected_return(weights, returns):
+    # Annualized from the mean daily return; weights may be one vector or a
+    # matrix with one portfolio per row
+    return np.dot(weights, np.mean(returns, axis=0)) * 252
+
+
+# ============ BULK ONBOARDING ============
+# Profiles carry age, horizon, risk and optionally a strategy column
+# ("basic", "bionic" or "hrp"; "basic" when absent).
+STRATEGIES = ["basic", "bionic", "hrp"]
+BATCH_CHUNK_ROWS = 50_000
+
+
+@profiled
+def batch_allocate(profiles, returns, hrp=None):
+    # All rule-based rows are resolved by indexing one stacked table of
+    # candidate portfolios; every "hrp" row shares the same single clustering
+    strategy = profiles["strategy"] if "strategy" in profiles else pd.Series("basic", index=profiles.index)
+    strategy_idx = pd.Index(STRATEGIES).get_indexer(normalized(strategy))
+    if (strategy_idx < 0).any():
+        raise ValueError(f"Unknown strategy ({invalid_rows(strategy, strategy_idx < 0)}); expected one of {STRATEGIES}")
+    if hrp is None:
+        hrp = hrp_allocation(returns).values if (strategy_idx == 2).any() else np.full(len(STOCKS), np.nan)
+
+    candidates = np.vstack([
+        BASIC_ALLOCATIONS / BASIC_ALLOCATIONS.sum(axis=1, keepdims=True),
+        BIONIC_ALLOCATIONS / BIONIC_ALLOCATIONS.sum(axis=1, keepdims=True),
+        hrp,
+    ])
+    # Risk is only read for basic rows and age for bionic ones, so the
+    # other strategies may leave them blank or out
+    row = np.full(len(profiles), len(candidates) - 1)
+    basic, bionic = strategy_idx == 0, strategy_idx == 1
+    required = ["horizon"] + (["risk"] if basic.any() else []) + (["age"] if bionic.any() else [])
+    missing = [column for column in required if column not in profiles]
+    if missing:
+        raise ValueError(f"Missing profile columns {missing}")
+    if basic.any():
+        row[basic] = risk_level_index(profiles["risk"][basic])
+    horizon = numeric_field(profiles["horizon"], "horizon")
+    if bionic.any():
+        row[bionic] = len(BASIC_ALLOCATIONS) + bionic_age_index(numeric_field(profiles["age"][bionic], "age"))
+    weights = pd.DataFrame(candidates[row], index=profiles.index, columns=STOCKS)
+    portfolio_return = expected_return(weights.values, returns)
+    summary = pd.DataFrame({
+        "Expected Return": portfolio_return,
+        "Expected Growth Multiple": (1 + portfolio_return) ** horizon,
+    }, index=profiles.index)
+    return weights, summary
+
+
+def read_profile_chunks(source, chunk_rows=BATCH_CHUNK_ROWS):
+    if str(getattr(source, "name", source)).endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_rows)
+
+
+@profiled
+def batch_allocate_file(source, destination, returns, chunk_rows=BATCH_CHUNK_ROWS):
+    # Streams profiles in chunks and appends each allocated chunk to a CSV or
+    # Parquet file, so memory stays at one chunk whatever the file size
+    hrp = None
+    writer = None
+    rows = 0
+    try:
+        for chunk in read_profile_chunks(source, chunk_rows):
+            if hrp is None and "strategy" in chunk and (normalized(chunk["strategy"]) == "hrp").any():
+                hrp = hrp_allocation(returns).values
+            weights, summary = batch_allocate(chunk, returns, hrp)
+            result = pd.concat([chunk, weights, summary], axis=1)
+            if str(destination).endswith(".parquet"):
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(result, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(destination, table.schema)
+                writer.write_table(table)
+            else:
+                result.to_csv(destination, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+            rows += len(result)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
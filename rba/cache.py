@@ -0,0 +1,199 @@
+# === Persistent result cache: SQLite on local disk, shared across restarts ===
+#
+# Functions decorated with @persistent look their result up by a key built
+# from the function name and its arguments (arrays by content fingerprint,
+# so the same returns window hits whatever object holds it) and store misses
+# as pickles. The cache is off unless RBA_RESULT_CACHE names a database file;
+# then it is opened on first use, shared by every thread and process on the
+# machine, capped at RBA_RESULT_CACHE_BYTES with least-recently-used eviction,
+# and keeps a hit count per entry so a restarted server can preload the
+# entries it will most likely need. Keys are salted with a hash of the rba
+# sources, so entries written by other code are never served and age out.
+import atexit
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from rba.jobs import job_key
+
+RESULT_CACHE_PATH = os.environ.get("RBA_RESULT_CACHE")
+RESULT_CACHE_BYTES = int(os.environ.get("RBA_RESULT_CACHE_BYTES", 512 * 2**20))
+PRELOAD_ENTRIES = 64
+# Hits counted in memory before their counts and times are written back
+HIT_FLUSH_COUNT = 256
+# Arguments that can be keyed; anything else (an iterator of chunks, a
+# DataFrame) bypasses the cache
+KEYABLE_TYPES = (np.ndarray, str, int, float, bool, type(None), type, np.generic)
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    # Hash of the package's sources, read once per process
+    digest = hashlib.blake2b(digest_size=8)
+    for name in sorted(os.listdir(PACKAGE_DIR)):
+        if name.endswith(".py"):
+            with open(os.path.join(PACKAGE_DIR, name), "rb") as f:
+                digest.update(name.encode() + f.read())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, path, max_bytes=RESULT_CACHE_BYTES):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # Under WAL a crash can lose the last commits but never corrupts the
+        # file, which is fine for a cache
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, name TEXT, value BLOB, size INTEGER,"
+            " hits INTEGER DEFAULT 0, created REAL, last_used REAL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        # Pickles of preloaded entries, served without touching the database
+        # (unpickled on every hit, so callers never share an object)
+        self.memory = {}
+        # key: (hits, last used) not yet written back; a read never writes,
+        # the counts go out in one batch with the next put, evict or stats
+        # or after HIT_FLUSH_COUNT hits
+        self.hits = {}
+        self.unwritten_hits = 0
+
+    def get(self, key):
+        # (found, value)
+        with self.lock:
+            blob = self.memory.get(key)
+            if blob is None:
+                row = self.connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return False, None
+                blob = row[0]
+            self.hits[key] = (self.hits.get(key, (0, 0))[0] + 1, time.time())
+            self.unwritten_hits += 1
+            if self.unwritten_hits >= HIT_FLUSH_COUNT:
+                self.write_hits()
+        return True, pickle.loads(blob)
+
+    def write_hits(self):
+        # Called with the lock held
+        if self.hits:
+            self.connection.executemany(
+                "UPDATE results SET hits = hits + ?, last_used = MAX(last_used, ?) WHERE key = ?",
+                [(hits, last_used, key) for key, (hits, last_used) in self.hits.items()])
+        self.hits.clear()
+        self.unwritten_hits = 0
+
+    def flush(self):
+        with self.lock:
+            self.write_hits()
+
+    def put(self, key, name, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes // 4:
+            return
+        now = time.time()
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results (key, name, value, size, hits, created, last_used)"
+                " VALUES (?, ?, ?, ?, 0, ?, ?)", (key, name, blob, len(blob), now, now))
+            self.evict()
+
+    def evict(self):
+        # Least recently used first, until the total fits again
+        self.write_hits()
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in self.connection.execute("SELECT key, size FROM results ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self.connection.executemany("DELETE FROM results WHERE key = ?", doomed)
+        for (key,) in doomed:
+            self.memory.pop(key, None)
+
+    def preload(self, entries=PRELOAD_ENTRIES):
+        # The most-hit entries into memory; returns how many were loaded
+        with self.lock:
+            self.write_hits()
+            rows = self.connection.execute(
+                "SELECT key, value FROM results ORDER BY hits DESC, last_used DESC LIMIT ?", (entries,)).fetchall()
+            self.memory.update(rows)
+        return len(rows)
+
+    def stats(self):
+        with self.lock:
+            self.write_hits()
+            entries, size, hits = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM results").fetchone()
+        return {"entries": entries, "bytes": size, "hits": hits, "preloaded": len(self.memory)}
+
+    def clear(self):
+        with self.lock:
+            self.connection.execute("DELETE FROM results")
+            self.memory.clear()
+            self.hits.clear()
+            self.unwritten_hits = 0
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def result_cache(path=None):
+    # The cache at `path` (default RBA_RESULT_CACHE), opened once per
+    # process; None when no path is configured
+    path = path or RESULT_CACHE_PATH
+    if not path:
+        return None
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = ResultCache(path)
+            atexit.register(_caches[path].flush)
+        return _caches[path]
+
+
+def cache_key(name, args, kwargs):
+    values = [*args, *kwargs.values()]
+    if not all(isinstance(value, KEYABLE_TYPES) or
+               (isinstance(value, (list, tuple)) and all(isinstance(v, KEYABLE_TYPES) for v in value))
+               for value in values):
+        return None
+    return job_key(name, *args, **kwargs)
+
+
+def persistent(name=None):
+    # @persistent or @persistent("label"); the label defaults to the
+    # qualified name. Keys also cover code_version(), so a deploy that changes
+    # the function or anything in rba it calls starts its entries afresh.
+    if callable(name):
+        return persistent()(name)
+
+    def decorate(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache = result_cache()
+            key = None if cache is None else cache_key(f"{label}@{code_version()}", args, kwargs)
+            if key is None:
+                return fn(*args, **kwargs)
+            found, value = cache.get(key)
+            if found:
+                return value
+            value = fn(*args, **kwargs)
+            cache.put(key, label, value)
+            return value
+        return wrapper
+    return decorate
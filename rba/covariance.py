@@ -0,0 +1,110 @@
+# === Covariance estimation: one streaming pass, float32 storage, shrinkage ===
+#
+# Returns are read in row chunks, so the history can be a memmap (a
+# ReturnsStore window) far larger than RAM; memory is the (assets x assets)
+# accumulator plus one chunk. Each chunk is shifted by the first chunk's mean
+# to keep the raw sums well conditioned, as in hrp_backtest, and adds to
+# running sums from which the covariance, the correlation and the Ledoit-Wolf
+# shrinkage intensity all follow without a second pass.
+from collections import namedtuple
+
+import numpy as np
+
+from rba.cache import persistent
+from rba.profiling import profiled
+
+COVARIANCE_CHUNK_ROWS = 4096
+SHRINKAGE_METHODS = [None, "ledoit-wolf"]
+
+CovarianceEstimate = namedtuple("CovarianceEstimate", ["covariance", "correlation", "mean", "shrinkage", "count"])
+
+
+class CovarianceAccumulator:
+    # Sums over rows x (shifted): x, x x', and for shrinkage q = |x|^2, q^2
+    # and q x, which expand sum_t |x_t - mean|^4 without knowing the mean
+    # in advance
+
+    def __init__(self, n_assets):
+        self.count = 0
+        self.shift = None
+        self.sum_x = np.zeros(n_assets)
+        self.sum_xx = np.zeros((n_assets, n_assets))
+        self.sum_q = 0.0
+        self.sum_q2 = 0.0
+        self.sum_qx = np.zeros(n_assets)
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if len(chunk) == 0:
+            return
+        if self.shift is None:
+            self.shift = chunk.mean(axis=0)
+        x = chunk - self.shift
+        q = np.einsum("ij,ij->i", x, x)
+        self.count += len(x)
+        self.sum_x += x.sum(axis=0)
+        self.sum_xx += x.T @ x
+        self.sum_q += q.sum()
+        self.sum_q2 += q @ q
+        self.sum_qx += q @ x
+
+    def estimate(self, shrinkage=None, dtype=np.float64):
+        if shrinkage not in SHRINKAGE_METHODS:
+            raise ValueError(f"Unknown shrinkage {shrinkage!r}; expected one of {SHRINKAGE_METHODS}")
+        if self.count < 2:
+            raise ValueError("Need at least two rows of returns")
+        count = self.count
+        mean = self.sum_x / count
+        scatter = self.sum_xx - count * np.outer(mean, mean)
+        intensity = 0.0
+        if shrinkage is None:
+            covariance = scatter / (count - 1)
+        else:
+            covariance, intensity = self.ledoit_wolf(scatter / count, mean)
+
+        vol = np.sqrt(np.diag(covariance))
+        correlation = covariance / vol[:, None]
+        correlation /= vol
+        np.clip(correlation, -1, 1, out=correlation)
+        np.fill_diagonal(correlation, 1)
+        return CovarianceEstimate(covariance.astype(dtype, copy=False), correlation.astype(dtype, copy=False),
+                                  self.shift + mean, intensity, count)
+
+    def ledoit_wolf(self, sample, mean):
+        # Ledoit and Wolf (2004): shrink the maximum-likelihood covariance
+        # towards the scaled identity by the estimated optimal intensity
+        count, n = self.count, len(mean)
+        target = np.trace(sample) / n
+        c = mean @ mean
+        # sum_t |x_t - mean|^4, with q_t = |x_t|^2 and r_t = x_t . mean
+        fourth = (self.sum_q2 - 4 * mean @ self.sum_qx + 4 * mean @ self.sum_xx @ mean
+                  + 2 * c * self.sum_q - 3 * count * c ** 2)
+        sample_norm = np.sum(sample ** 2)
+        beta = (fourth / count - sample_norm) / (n * count)
+        delta = (sample_norm - 2 * target * np.trace(sample) + n * target ** 2) / n
+        beta = min(beta, delta)
+        intensity = 0.0 if beta <= 0 else beta / delta
+        shrunk = (1 - intensity) * sample
+        shrunk[np.diag_indices(n)] += intensity * target
+        return shrunk, intensity
+
+
+@profiled
+@persistent
+def estimate_covariance(returns, shrinkage=None, dtype=np.float64, chunk_rows=COVARIANCE_CHUNK_ROWS):
+    # returns is a (days x assets) array or memmap, or an iterable of row
+    # chunks (e.g. read from files one at a time). Without shrinkage the
+    # covariance matches np.cov (ddof=1); with "ledoit-wolf" it is the shrunk
+    # maximum-likelihood estimate. dtype=np.float32 halves the memory of the
+    # results; the sums are always float64.
+    if hasattr(returns, "shape"):
+        chunks = (returns[start:start + chunk_rows] for start in range(0, returns.shape[0], chunk_rows))
+        accumulator = CovarianceAccumulator(returns.shape[1])
+    else:
+        chunks = iter(returns)
+        first = np.asarray(next(chunks))
+        accumulator = CovarianceAccumulator(first.shape[1])
+        accumulator.update(first)
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator.estimate(shrinkage, dtype)
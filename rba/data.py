@@ -0,0 +1,120 @@
+# === Return data: demo universe, on-disk returns store, fingerprints ===
+import functools
+import hashlib
+import os
+
+import numpy as np
+
+from rba.profiling import profiled
+
+STOCKS = [
+    'Apple (AAPL)', 'Microsoft (MSFT)', 'Amazon (AMZN)', 'Tesla (TSLA)', 'Nvidia (NVDA)',
+    'JPMorgan Chase (JPM)', 'Johnson & Johnson (JNJ)', 'ExxonMobil (XOM)',
+    'Berkshire Hathaway (BRK.B)', 'Meta Platforms (META)'
+]
+
+TICKERS = [name[name.rindex("(") + 1:-1] for name in STOCKS]
+
+LOOKBACK_DAYS = 252
+
+
+class ReturnsStore:
+    # A directory holding returns.npy (days x tickers, float32, Fortran order
+    # so each ticker's history is contiguous), tickers.txt (one per line) and
+    # optionally dates.npy (datetime64[D], one per row). The panel is opened
+    # with mmap_mode="r": nothing is read until a window is sliced, and the
+    # pages are shared through the OS page cache by every worker process.
+
+    def __init__(self, path):
+        self.path = path
+        self.returns = np.load(os.path.join(path, "returns.npy"), mmap_mode="r")
+        with open(os.path.join(path, "tickers.txt")) as f:
+            self.tickers = [line.strip() for line in f if line.strip()]
+        dates_path = os.path.join(path, "dates.npy")
+        self.dates = np.load(dates_path) if os.path.exists(dates_path) else None
+        self.ticker_index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        if self.returns.shape[1] != len(self.tickers):
+            raise ValueError(f"{path}: {self.returns.shape[1]} return columns but {len(self.tickers)} tickers")
+
+    @staticmethod
+    def write(path, returns, tickers, dates=None, chunk_rows=4096):
+        # Copied in row chunks, so returns may itself be a memmap larger than RAM
+        os.makedirs(path, exist_ok=True)
+        panel = np.lib.format.open_memmap(
+            os.path.join(path, "returns.npy"), mode="w+", dtype=np.float32,
+            shape=returns.shape, fortran_order=True,
+        )
+        for start in range(0, returns.shape[0], chunk_rows):
+            panel[start:start + chunk_rows] = returns[start:start + chunk_rows]
+        panel.flush()
+        with open(os.path.join(path, "tickers.txt"), "w") as f:
+            f.write("\n".join(tickers) + "\n")
+        if dates is not None:
+            np.save(os.path.join(path, "dates.npy"), np.asarray(dates, dtype="datetime64[D]"))
+        return ReturnsStore(path)
+
+    def window(self, tickers=None, start=None, end=None, days=None):
+        # The rows of window_rows; the row slice is a zero-copy view, and a
+        # ticker subset gathers just those columns
+        first, last = window_rows(self.returns.shape[0], self.dates, start, end, days)
+        panel = self.returns[first:last]
+        if tickers is None:
+            return panel
+        return panel[:, [self.ticker_index[ticker] for ticker in tickers]]
+
+
+def window_rows(n_rows, dates=None, start=None, end=None, days=None):
+    # (first, last) rows between the start/end dates (inclusive; row
+    # positions without dates), optionally only the last `days` of them
+    if dates is not None:
+        first = 0 if start is None else np.searchsorted(dates, np.datetime64(start, "D"))
+        last = len(dates) if end is None else np.searchsorted(dates, np.datetime64(end, "D"), side="right")
+    else:
+        first = 0 if start is None else start
+        last = n_rows if end is None else end
+    if days is not None:
+        first = max(first, last - days)
+    return int(first), int(last)
+
+
+@functools.lru_cache(maxsize=None)
+def open_returns_store(path):
+    return ReturnsStore(path)
+
+
+def synthetic_returns(days=LOOKBACK_DAYS, n_assets=len(STOCKS), seed=42):
+    return np.random.RandomState(seed).randn(days, n_assets) / 100
+
+
+@profiled
+def load_returns(store_path=None, lookback_days=LOOKBACK_DAYS, tickers=TICKERS):
+    # (history, dates, returns): the full history of `tickers`, its dates (None
+    # without a store) and the trailing lookback window the advisors use.
+    # Without a store the synthetic year stands in for both.
+    if store_path:
+        store = open_returns_store(store_path)
+        history = store.window(tickers)
+        return history, store.dates, history[-lookback_days:]
+    returns = synthetic_returns(lookback_days, len(tickers))
+    return returns, None, returns
+
+
+FINGERPRINT_SAMPLE_ROWS = 64
+
+
+def returns_fingerprint(returns):
+    if isinstance(returns, np.memmap) and returns.filename:
+        # Views of an on-disk panel: identify the file and the window by its
+        # shape, strides and a handful of evenly spaced rows rather than
+        # reading the whole window
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{returns.filename}{os.stat(returns.filename).st_mtime_ns}".encode())
+        digest.update(f"{returns.dtype.str}{returns.shape}{returns.strides}".encode())
+        rows = np.linspace(0, len(returns) - 1, min(len(returns), FINGERPRINT_SAMPLE_ROWS)).astype(int)
+        digest.update(np.ascontiguousarray(returns[rows]))
+        return digest.hexdigest()
+    returns = np.ascontiguousarray(returns)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{returns.dtype.str}{returns.shape}".encode())
+    digest.update(returns.reshape(-1).view(np.uint8))
+    return digest.hexdigest()
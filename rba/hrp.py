@@ -0,0 +1,272 @@
+# === Hierarchical Risk Parity: clustering, allocation and backtest ===
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import scipy.cluster.hierarchy as sch
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import minimum_spanning_tree
+from scipy.spatial.distance import squareform
+
+from rba.cache import persistent
+from rba.covariance import estimate_covariance
+from rba.data import STOCKS
+from rba.profiling import profiled
+
+LINKAGE_METHODS = ["single", "average", "complete", "ward"]
+# Approximate HRP: correlation neighbours kept per asset, and assets per
+# block when scanning for them
+HRP_NEIGHBOURS = 20
+HRP_SCAN_BLOCK = 512
+
+
+def cluster_ranges(starts, stops):
+    # Flat positions covered by the half-open ranges [starts, stops)
+    lengths = stops - starts
+    offsets = np.repeat(stops - np.cumsum(lengths), lengths)
+    return np.arange(lengths.sum()) + offsets
+
+
+def get_cluster_variance(prefix, starts, stops):
+    # Equal-weight variance of the blocks [start, stop) of the quasi-diagonal
+    # covariance. With row-wise prefix sums each row of a block contributes
+    # prefix[row, stop] - prefix[row, start], so a whole level of blocks
+    # costs O(n) lookups
+    lengths = stops - starts
+    rows = cluster_ranges(starts, stops)
+    row_sums = (prefix[rows, np.repeat(stops, lengths)]
+                - prefix[rows, np.repeat(starts, lengths)])
+    return np.add.reduceat(row_sums, np.cumsum(lengths) - lengths) / lengths ** 2
+
+
+def bisection_weights(sorted_idx, cluster_variance):
+    # Bisect every cluster of the current level at once; clusters are
+    # contiguous position ranges of the quasi-diagonal ordering and
+    # cluster_variance(starts, stops) gives their equal-weight variances
+    n = len(sorted_idx)
+    weights = np.ones(n)
+    starts, stops = np.array([0]), np.array([n])
+    while True:
+        keep = stops - starts > 1
+        starts, stops = starts[keep], stops[keep]
+        if len(starts) == 0:
+            break
+        splits = starts + (stops - starts) // 2
+        left_var = cluster_variance(starts, splits)
+        right_var = cluster_variance(splits, stops)
+        alpha = 1 - left_var / (left_var + right_var)
+        weights[cluster_ranges(starts, splits)] *= np.repeat(alpha, splits - starts)
+        weights[cluster_ranges(splits, stops)] *= np.repeat(1 - alpha, stops - splits)
+        starts, stops = np.concatenate([starts, splits]), np.concatenate([splits, stops])
+
+    result = np.empty(n)
+    result[sorted_idx] = weights / weights.sum()
+    return result
+
+
+def hrp_weights(cov, sorted_idx):
+    n = len(sorted_idx)
+    prefix = np.zeros((n, n + 1))
+    np.cumsum(cov.take(sorted_idx, axis=0).take(sorted_idx, axis=1), axis=1, out=prefix[:, 1:])
+    return bisection_weights(sorted_idx, lambda starts, stops: get_cluster_variance(prefix, starts, stops))
+
+
+def returns_hrp_weights(returns, sorted_idx):
+    # hrp_weights without the covariance: a block's equal-weight variance is
+    # the variance of its average daily return, and with prefix sums of the
+    # demeaned returns across the sorted assets every block's average is one
+    # subtraction per day, so memory is (days x assets) rather than
+    # (assets x assets)
+    demeaned = returns[:, sorted_idx] - np.mean(returns, axis=0)[sorted_idx]
+    prefix = np.zeros((len(returns), len(sorted_idx) + 1))
+    np.cumsum(demeaned, axis=1, out=prefix[:, 1:])
+
+    def cluster_variance(starts, stops):
+        means = (prefix[:, stops] - prefix[:, starts]) / (stops - starts)
+        return np.einsum("ij,ij->j", means, means) / (len(returns) - 1)
+    return bisection_weights(sorted_idx, cluster_variance)
+
+
+def covariance_and_correlation(returns, shrinkage=None):
+    # One streaming pass; the correlation is derived from the covariance
+    estimate = estimate_covariance(returns, shrinkage)
+    return estimate.covariance, estimate.correlation
+
+
+def linkage_from_correlation(corr, method="single"):
+    # Condensed correlation distance, built once from the upper triangle
+    dist = 0.5 * (1 - squareform(corr, checks=False))
+    return sch.linkage(np.sqrt(np.clip(dist, 0, None, out=dist), out=dist), method=method)
+
+
+@profiled
+@persistent
+def cluster_linkage(returns, method="single", shrinkage=None):
+    _, corr = covariance_and_correlation(returns, shrinkage)
+    return linkage_from_correlation(corr, method)
+
+
+@profiled
+@persistent
+def hrp_allocation(returns, method="single", linkage=None, universe=None, shrinkage=None):
+    # Pass a precomputed `linkage` to reuse a tree when only downstream
+    # inputs change
+    cov, corr = covariance_and_correlation(returns, shrinkage)
+    if linkage is None:
+        linkage = linkage_from_correlation(corr, method)
+    sorted_idx = sch.leaves_list(linkage)
+    return pd.Series(hrp_weights(cov, sorted_idx), index=STOCKS if universe is None else universe)
+
+
+def correlation_neighbours(returns, neighbours=HRP_NEIGHBOURS, block=HRP_SCAN_BLOCK):
+    # The `neighbours` most correlated assets of every asset, as (rows, cols,
+    # correlations) edge lists. Correlations are scanned a block of rows at a
+    # time from standardized float32 returns, so memory is (block x assets);
+    # the scan still does O(assets^2 * days) work.
+    n = returns.shape[1]
+    k = min(neighbours, n - 1)
+    std = np.std(returns, axis=0, ddof=1) * np.sqrt(len(returns) - 1)
+    standardized = ((returns - np.mean(returns, axis=0)) / std).astype(np.float32)
+    rows, cols, corrs = [], [], []
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        corr = standardized[:, start:stop].T @ standardized
+        corr[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        nearest = np.argpartition(-corr, k - 1, axis=1)[:, :k]
+        rows.append(np.repeat(np.arange(start, stop), k))
+        cols.append(nearest.ravel())
+        corrs.append(np.take_along_axis(corr, nearest, axis=1).ravel())
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(corrs).astype(float)
+
+
+def linkage_from_edges(n, rows, cols, dist):
+    # Single linkage is the minimum spanning tree with its edges merged in
+    # order of length. A sparse graph may leave several components; they are
+    # joined last at the largest possible correlation distance, 1.
+    graph = coo_matrix((np.maximum(dist, np.finfo(float).tiny), (rows, cols)), shape=(n, n))
+    tree = minimum_spanning_tree(graph).tocoo()
+    order = np.argsort(tree.data, kind="stable")
+    edges = zip(tree.row[order].tolist(), tree.col[order].tolist(), tree.data[order].tolist())
+
+    parent = list(range(2 * n - 1))
+    size = [1] * n + [0] * (n - 1)
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    linkage = np.empty((n - 1, 4))
+    merged = 0
+    for a, b, d in edges:
+        a, b = root(a), root(b)
+        linkage[merged] = min(a, b), max(a, b), d, size[a] + size[b]
+        parent[a] = parent[b] = n + merged
+        size[n + merged] = size[a] + size[b]
+        merged += 1
+    roots = sorted({root(i) for i in range(n)})
+    while len(roots) > 1:
+        a, b = roots.pop(0), roots.pop(0)
+        linkage[merged] = a, b, 1.0, size[a] + size[b]
+        parent[a] = parent[b] = n + merged
+        size[n + merged] = size[a] + size[b]
+        roots.append(n + merged)
+        merged += 1
+    return linkage
+
+
+@profiled
+def approximate_hrp_allocation(returns, neighbours=HRP_NEIGHBOURS, universe=None):
+    # Single-linkage HRP for universes too large for a dense correlation
+    # matrix: the tree comes from the minimum spanning tree of a
+    # nearest-neighbour correlation graph, which is the exact single-linkage
+    # tree whenever the graph contains every edge of the full one, and the
+    # bisection reads block variances straight from the returns
+    returns = np.asarray(returns, dtype=float)
+    n = returns.shape[1]
+    rows, cols, corr = correlation_neighbours(returns, neighbours)
+    dist = np.sqrt(np.clip(0.5 * (1 - corr), 0, None))
+    sorted_idx = sch.leaves_list(linkage_from_edges(n, rows, cols, dist))
+    return pd.Series(returns_hrp_weights(returns, sorted_idx), index=STOCKS if universe is None else universe)
+
+
+@profiled
+def hrp_approximation_error(returns, neighbours=HRP_NEIGHBOURS):
+    # How far approximate_hrp_allocation lands from exact single-linkage HRP
+    # on a universe small enough for both
+    exact = hrp_allocation(np.asarray(returns), "single", universe=range(returns.shape[1])).values
+    approximate = approximate_hrp_allocation(returns, neighbours, universe=range(returns.shape[1])).values
+    difference = approximate - exact
+    return pd.Series({
+        "Max Weight Difference": np.abs(difference).max(),
+        "Max Relative Difference": (np.abs(difference) / exact).max(),
+        # Fraction of the portfolio traded to move from one to the other
+        "Turnover": np.abs(difference).sum() / 2,
+        "Tracking Error": np.std(np.asarray(returns) @ difference, ddof=1) * np.sqrt(252),
+    }, name=returns.shape[1])
+
+
+BacktestResult = namedtuple("BacktestResult", ["weights", "turnover", "portfolio_returns"])
+
+
+@profiled
+def hrp_backtest(returns, lookback=252, step=21, expanding=False, method="single",
+                 universe=None, dates=None):
+    # Re-runs HRP every `step` rows on the trailing `lookback` rows (or all
+    # rows so far when expanding). The window's sums and cross-products are
+    # updated with only the rows entering and leaving it, so each step costs
+    # O(step * n^2) instead of a fresh np.cov over the whole window. Returns
+    # are shifted by the first window's mean to keep the running sums well
+    # conditioned.
+    n_rows, n = returns.shape
+    shift = np.mean(returns[:lookback], axis=0, dtype=np.float64)
+    sum_returns = np.zeros(n)
+    sum_products = np.zeros((n, n))
+    window_start = window_end = 0
+
+    rebalance_rows = np.arange(lookback, n_rows, step)
+    weights = np.empty((len(rebalance_rows), n))
+    for k, row in enumerate(rebalance_rows):
+        entering = returns[window_end:row] - shift
+        leaving = np.empty((0, n))
+        if not expanding and row - lookback > window_start:
+            leaving = returns[window_start:row - lookback] - shift
+            window_start = row - lookback
+        window_end = row
+        sum_returns += entering.sum(axis=0) - leaving.sum(axis=0)
+        sum_products += np.concatenate([entering, -leaving]).T @ np.concatenate([entering, leaving])
+
+        count = window_end - window_start
+        mean = sum_returns / count
+        cov = sum_products - count * np.outer(mean, mean)
+        cov /= count - 1
+        vol = np.sqrt(np.diag(cov))
+        corr = cov / vol[:, None]
+        corr /= vol
+        sorted_idx = sch.leaves_list(linkage_from_correlation(corr, method))
+        weights[k] = hrp_weights(cov, sorted_idx)
+
+    # Hold each allocation until the next rebalance, letting it drift with
+    # the market; turnover is the one-way fraction of the portfolio traded to
+    # get back to target, as in hrp_approximation_error and
+    # simulate_rebalancing (the first rebalance buys from cash, so shows 50%)
+    turnover = np.empty(len(rebalance_rows))
+    realized = []
+    drifted = np.zeros(n)
+    for k, row in enumerate(rebalance_rows):
+        turnover[k] = np.abs(weights[k] - drifted).sum() / 2
+        stop = rebalance_rows[k + 1] if k + 1 < len(rebalance_rows) else n_rows
+        growth = np.cumprod(1 + np.asarray(returns[row:stop], dtype=np.float64), axis=0)
+        values = growth @ weights[k]
+        realized.append(values / np.concatenate([[1.0], values[:-1]]) - 1)
+        drifted = weights[k] * growth[-1] / values[-1]
+
+    index = rebalance_rows if dates is None else dates[rebalance_rows]
+    days = np.arange(lookback, n_rows) if dates is None else dates[lookback:]
+    columns = STOCKS if universe is None else universe
+    return BacktestResult(
+        pd.DataFrame(weights, index=index, columns=columns),
+        pd.Series(turnover, index=index, name="Turnover"),
+        pd.Series(np.concatenate([np.empty(0)] + realized), index=days, name="Portfolio Return"),
+    )
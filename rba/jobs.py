@@ -0,0 +1,106 @@
+# === Background jobs: one shared pool with coalescing of identical requests ===
+#
+#   queue = job_queue()
+#   job = queue.submit(job_key("hrp_backtest", history, 252), hrp_backtest, history, 252)
+#   if job.done():
+#       result = job.result()
+#
+# The queue is process-wide, so every session submits to the same pool.
+# Submitting a key that is already running, or finished among the last
+# JOB_RESULTS jobs, returns that job instead of starting another: many
+# sessions asking for the same inputs share one computation. Failed jobs are
+# not kept, so the next submit retries.
+import functools
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from rba.data import returns_fingerprint
+
+JOB_WORKERS = int(os.environ.get("RBA_JOB_WORKERS", os.cpu_count()))
+# "thread" suits numpy and scipy, which release the GIL in their heavy
+# loops; "process" pickles every argument and result
+JOB_POOL = os.environ.get("RBA_JOB_POOL", "thread")
+JOB_RESULTS = 64
+
+
+def job_key(name, *args, **kwargs):
+    # Arrays are identified by their fingerprint, everything else by repr
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(name.encode())
+    for value in [*args, *(item for pair in sorted(kwargs.items()) for item in pair)]:
+        digest.update(returns_fingerprint(value).encode() if isinstance(value, np.ndarray) else repr(value).encode())
+    return digest.hexdigest()
+
+
+class Job:
+    def __init__(self, name, future):
+        self.name = name
+        self.future = future
+        self.started = time.perf_counter()
+
+    def done(self):
+        return self.future.done()
+
+    def failed(self):
+        return self.future.done() and self.future.exception() is not None
+
+    def result(self):
+        return self.future.result()
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+class JobQueue:
+    def __init__(self, workers=JOB_WORKERS, pool=JOB_POOL):
+        if pool not in ("thread", "process"):
+            raise ValueError(f"Unknown job pool {pool!r}; expected 'thread' or 'process'")
+        self.executor = (ThreadPoolExecutor if pool == "thread" else ProcessPoolExecutor)(workers)
+        self.lock = threading.Lock()
+        self.jobs = OrderedDict()
+        # Wall time of the last finished run of each job name, for progress
+        self.durations = {}
+
+    def submit(self, key, fn, *args, name=None, **kwargs):
+        name = name or fn.__name__
+        with self.lock:
+            job = self.jobs.get(key)
+            if job is not None and not job.failed():
+                self.jobs.move_to_end(key)
+                return job
+            job = Job(name, self.executor.submit(fn, *args, **kwargs))
+            self.jobs[key] = job
+            self.evict()
+        job.future.add_done_callback(lambda _: self.durations.__setitem__(name, job.elapsed()))
+        return job
+
+    def evict(self):
+        # Oldest finished jobs beyond JOB_RESULTS; running ones always stay
+        finished = [key for key, job in self.jobs.items() if job.done()]
+        for key in finished[:max(len(finished) - JOB_RESULTS, 0)]:
+            del self.jobs[key]
+
+    def progress(self, job):
+        # Fraction of the last run of the same name this one has taken,
+        # capped short of done; None the first time a name runs
+        expected = self.durations.get(job.name)
+        if job.done():
+            return 1.0
+        if not expected:
+            return None
+        return min(job.elapsed() / expected, 0.95)
+
+    def running(self):
+        with self.lock:
+            return sum(not job.done() for job in self.jobs.values())
+
+
+@functools.lru_cache(maxsize=None)
+def job_queue(workers=JOB_WORKERS, pool=JOB_POOL):
+    return JobQueue(workers, pool)
@@ -0,0 +1,166 @@
+# === Precomputed allocation table over the age x horizon x risk grid ===
+#
+#   python -m rba.lookup --store data/returns --workers 4
+#
+# Every advisor input comes from a small bounded domain, and the grid
+# collapses to a handful of distinct portfolios: Human weights depend only on
+# the risk level, Bionic weights only on the age bucket and HRP only on the
+# linkage method. Projections for every horizon up to MAX_HORIZON are prefixes
+# of one MAX_HORIZON-year simulation, and wealth scales with the initial
+# investment. So the table holds, per distinct portfolio, its weights, its
+# expected return and a quantile grid of the growth of $1 for every year,
+# plus index arrays mapping each grid cell to its portfolio row. Building it
+# runs one simulation per portfolio on a process pool; afterwards every
+# advisor interaction is a few array lookups.
+import argparse
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from rba.allocation import BASIC_ALLOCATIONS, BIONIC_ALLOCATIONS, RISK_LEVELS, bionic_age_index, risk_level_index
+from rba.cache import code_version
+from rba.data import LOOKBACK_DAYS, STOCKS, load_returns, returns_fingerprint
+from rba.hrp import LINKAGE_METHODS, hrp_allocation
+from rba.profiling import profiled
+from rba.projection import PROJECTION_PATHS, PROJECTION_PERCENTILES, simulate_growth
+
+AGES = np.arange(5, 101)
+HORIZONS = np.arange(1, 61)
+MAX_HORIZON = HORIZONS[-1]
+# Half-percent steps, so every PROJECTION_PERCENTILES band is a grid point
+QUANTILE_LEVELS = np.linspace(0, 1, 201)
+TABLE_DIR = os.environ.get("RBA_TABLE_DIR", os.path.join(tempfile.gettempdir(), "rba-tables"))
+
+
+class AllocationTable:
+    # Arrays, one row per distinct portfolio:
+    #   weights          (portfolios, assets)
+    #   expected_return  (portfolios,)                annualized
+    #   quantiles        (portfolios, years + 1, q)   growth of $1, float32
+    # and the grid indexes basic_rows[risk], bionic_rows[age - AGES[0]],
+    # hrp_rows[linkage method] pointing into them.
+
+    def __init__(self, arrays):
+        self.fingerprint = str(arrays["fingerprint"])
+        self.weights = arrays["weights"]
+        self.expected_return = arrays["expected_return"]
+        self.quantiles = arrays["quantiles"]
+        self.basic_rows = arrays["basic_rows"]
+        self.bionic_rows = arrays["bionic_rows"]
+        self.hrp_rows = arrays["hrp_rows"]
+
+    def row(self, strategy, risk="Medium", age=AGES[0], method="single"):
+        if strategy == "basic":
+            return self.basic_rows[risk_level_index(risk)[0]]
+        if strategy == "bionic":
+            return self.bionic_rows[np.clip(age, AGES[0], AGES[-1]) - AGES[0]]
+        if strategy == "hrp":
+            return self.hrp_rows[LINKAGE_METHODS.index(method)]
+        raise ValueError(f"Unknown strategy: {strategy}")
+
+    def allocation(self, row):
+        return pd.Series(self.weights[row], index=STOCKS)
+
+    @profiled("AllocationTable.projection")
+    def projection(self, row, initial_investment, years, goal):
+        # Same shape as growth_projection: percentile bands by year and the
+        # probability of ending each year at or above the goal, the latter
+        # interpolated on the quantile grid
+        if years > MAX_HORIZON:
+            raise ValueError(f"Horizon {years} is beyond the table's {MAX_HORIZON} years")
+        grid = self.quantiles[row, :years + 1]
+        positions = np.searchsorted(QUANTILE_LEVELS, np.array(PROJECTION_PERCENTILES) / 100)
+        bands = pd.DataFrame(grid[:, positions] * initial_investment,
+                             columns=[f"P{p}" for p in PROJECTION_PERCENTILES])
+        bands.index.name = "Year"
+        target = goal / initial_investment
+        below = np.array([np.interp(target, year, QUANTILE_LEVELS, left=0.0, right=1.0) for year in grid])
+        goal_probability = pd.Series(1 - below, index=bands.index, name="P(goal)")
+        return bands, goal_probability
+
+
+def portfolio_quantiles(weights, returns, n_paths=PROJECTION_PATHS):
+    wealth = simulate_growth(weights, returns, 1.0, MAX_HORIZON, n_paths)
+    return np.quantile(wealth, QUANTILE_LEVELS, axis=1).T.astype(np.float32)
+
+
+@profiled
+def build_allocation_table(returns, workers=os.cpu_count(), n_paths=PROJECTION_PATHS):
+    # workers=0 simulates in this process
+    fingerprint = returns_fingerprint(returns)
+    basic = BASIC_ALLOCATIONS / BASIC_ALLOCATIONS.sum(axis=1, keepdims=True)
+    bionic = BIONIC_ALLOCATIONS / BIONIC_ALLOCATIONS.sum(axis=1, keepdims=True)
+    hrp = np.array([hrp_allocation(returns, method).values for method in LINKAGE_METHODS])
+    weights = np.vstack([basic, bionic, hrp])
+
+    returns = np.asarray(returns)
+    if workers:
+        with ProcessPoolExecutor(workers) as pool:
+            quantiles = list(pool.map(portfolio_quantiles, weights, [returns] * len(weights),
+                                      [n_paths] * len(weights)))
+    else:
+        quantiles = [portfolio_quantiles(w, returns, n_paths) for w in weights]
+
+    return AllocationTable({
+        "fingerprint": fingerprint,
+        "weights": weights,
+        "expected_return": np.dot(weights, np.mean(returns, axis=0)) * 252,
+        "quantiles": np.stack(quantiles),
+        "basic_rows": np.arange(len(basic)),
+        "bionic_rows": len(basic) + bionic_age_index(AGES),
+        "hrp_rows": len(basic) + len(bionic) + np.arange(len(hrp)),
+    })
+
+
+def save_allocation_table(table, path):
+    # Written beside the target and renamed into place, so a concurrent
+    # reader never sees half a file
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, suffix=".npz", delete=False) as f:
+        np.savez(f, fingerprint=table.fingerprint, weights=table.weights,
+                 expected_return=table.expected_return, quantiles=table.quantiles,
+                 basic_rows=table.basic_rows, bionic_rows=table.bionic_rows, hrp_rows=table.hrp_rows)
+    os.replace(f.name, path)
+
+
+def allocation_table_path(returns, directory=TABLE_DIR):
+    # Tables are keyed by the returns fingerprint and the rba code version,
+    # so new data or a deploy that changes how tables are built gets a fresh
+    # table on first use, and unchanged data and code reuse the one on disk
+    return os.path.join(directory, f"allocation-table-{returns_fingerprint(returns)}-{code_version()}.npz")
+
+
+@profiled
+def load_allocation_table(returns, directory=TABLE_DIR, workers=os.cpu_count()):
+    path = allocation_table_path(returns, directory)
+    if os.path.exists(path):
+        with np.load(path) as arrays:
+            return AllocationTable(dict(arrays))
+    table = build_allocation_table(returns, workers)
+    save_allocation_table(table, path)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the allocation lookup table for a returns window.")
+    parser.add_argument("--store", default=os.environ.get("RBA_RETURNS_STORE"),
+                        help="returns store directory (default: $RBA_RETURNS_STORE, else synthetic data)")
+    parser.add_argument("--lookback-days", type=int, default=int(os.environ.get("RBA_LOOKBACK_DAYS", LOOKBACK_DAYS)))
+    parser.add_argument("--directory", default=TABLE_DIR, help="where tables are kept (default: $RBA_TABLE_DIR)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="simulation worker processes (0 runs them in this process)")
+    args = parser.parse_args(argv)
+
+    _, _, returns = load_returns(args.store, args.lookback_days)
+    table = load_allocation_table(returns, args.directory, args.workers)
+    print(f"Allocation table {table.fingerprint}: {len(table.weights)} portfolios, "
+          f"{len(AGES)} ages x {len(HORIZONS)} horizons x {len(RISK_LEVELS)} risk levels, "
+          f"{sum(a.nbytes for a in (table.weights, table.expected_return, table.quantiles)):,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+# === Constrained mean-variance optimization and the efficient frontier ===
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import cho_factor, cho_solve
+
+from rba.data import STOCKS
+from rba.profiling import profiled
+
+FRONTIER_POINTS = 100
+# Ridge added to the covariance, relative to its average eigenvalue, so the
+# free block stays positive definite when there are more assets than days
+MVO_RIDGE = 1e-8
+# Safety cap on active-set changes per solve, on top of ten per asset
+MVO_MAX_ITERATIONS = 200
+# Bound and multiplier violations smaller than this are rounding noise
+MVO_TOLERANCE = 1e-10
+# Updates to the free block's inverse between fresh factorizations, and the
+# smallest pivot, relative to the entering asset's variance, an update takes
+MVO_REFRESH = 64
+MVO_PIVOT = 1e-6
+
+Frontier = namedtuple("Frontier", ["weights", "expected_return", "volatility", "risk_tolerance"])
+
+AT_LOWER, FREE, AT_UPPER = -1, 0, 1
+
+
+def max_return_weights(mean, lower, upper):
+    # The linear program max mean'w over the same constraints: start every
+    # asset at its floor and fill the rest greedily by expected return
+    w = lower.copy()
+    budget = 1 - w.sum()
+    for i in np.argsort(-mean):
+        add = min(upper[i] - lower[i], budget)
+        w[i] += add
+        budget -= add
+    return w
+
+
+class MeanVarianceSolver:
+    # Solves  min 1/2 w'Sigma w - t mean'w  subject to sum(w) = 1 and
+    # lower <= w <= upper, for any risk tolerance t, with a primal active-set
+    # method: holding the weights that sit on a bound fixed, step towards the
+    # minimizer over the free ones, stopping at the first bound in the way,
+    # and release a bound only when its multiplier says the objective would
+    # improve. Every solve starts from the previous solution, which is
+    # feasible for any t, so along a frontier each point costs only as many
+    # steps as there are weights entering or leaving a bound, and each step
+    # updates the inverse of the free block in O(k^2) rather than factorizing
+    # it afresh.
+
+    def __init__(self, cov, mean, min_weight=0.0, max_weight=1.0):
+        n = len(mean)
+        self.lower = np.broadcast_to(np.asarray(min_weight, dtype=float), n).copy()
+        self.upper = np.broadcast_to(np.asarray(max_weight, dtype=float), n).copy()
+        if self.lower.sum() > 1 or self.upper.sum() < 1 or (self.lower > self.upper).any():
+            raise ValueError("Weight bounds leave no fully invested portfolio")
+        self.scale = np.trace(cov) / n
+        self.cov = cov
+        self.mean = mean
+        self.scaled_cov = cov / self.scale
+        self.scaled_cov[np.diag_indices(n)] += MVO_RIDGE
+        self.warm_start(max_return_weights(mean, self.lower, self.upper))
+        # Inverse of the free block, rows in `order`, for the free set `held`
+        self.held = np.zeros(n, dtype=bool)
+        self.order = np.empty(0, dtype=int)
+        self.inverse = None
+        self.updates = 0
+        self.factorizations = 0
+
+    def warm_start(self, w):
+        # Any fully invested w within the bounds
+        self.w = np.clip(w, self.lower, self.upper)
+        self.status = np.where(self.w <= self.lower, AT_LOWER, np.where(self.w >= self.upper, AT_UPPER, FREE))
+
+    def refresh(self, free):
+        self.order = np.flatnonzero(free)
+        factor = cho_factor(self.scaled_cov[np.ix_(self.order, self.order)])
+        self.inverse = cho_solve(factor, np.eye(len(self.order)))
+        self.factorizations += 1
+        self.held, self.updates = free.copy(), 0
+        return self.inverse
+
+    def free_inverse(self, free):
+        # Inverse of the free block for the free set `free`, brought over from
+        # the last call by deflating out each weight that left it and
+        # bordering in each that joined; refactorized every MVO_REFRESH
+        # updates to shed rounding, or when a pivot is too small to trust
+        leaving = np.flatnonzero(self.held & ~free)
+        entering = np.flatnonzero(free & ~self.held)
+        if self.inverse is None or self.updates + len(leaving) + len(entering) > MVO_REFRESH:
+            return self.refresh(free)
+        for i in leaving:
+            p = np.flatnonzero(self.order == i)[0]
+            keep = np.arange(len(self.order)) != p
+            column = self.inverse[keep, p]
+            self.inverse = self.inverse[np.ix_(keep, keep)] - np.outer(column, column / self.inverse[p, p])
+            self.order = self.order[keep]
+        for j in entering:
+            border = self.scaled_cov[self.order, j]
+            u = self.inverse @ border
+            pivot = self.scaled_cov[j, j] - border @ u
+            if pivot <= MVO_PIVOT * self.scaled_cov[j, j]:
+                return self.refresh(free)
+            k = len(self.order)
+            grown = np.empty((k + 1, k + 1))
+            grown[:k, :k] = self.inverse + np.outer(u, u / pivot)
+            grown[:k, k] = grown[k, :k] = -u / pivot
+            grown[k, k] = 1 / pivot
+            self.inverse, self.order = grown, np.append(self.order, j)
+        self.held = free.copy()
+        self.updates += len(leaving) + len(entering)
+        return self.inverse
+
+    def free_minimizer(self, free, w, linear):
+        # Minimizer over the free weights with the rest held where they are:
+        # Sigma_FF w_F = linear_F - Sigma_FB w_B - gamma, gamma set by the
+        # budget. Returns it with the budget multiplier gamma.
+        if not free.any():
+            return w, None
+        inverse = self.free_inverse(free)
+        bound = np.where(free, 0.0, w)
+        budget = 1 - bound.sum()
+        particular = inverse @ (linear[self.order] - (self.scaled_cov @ bound)[self.order])
+        homogeneous = inverse.sum(axis=1)
+        gamma = (particular.sum() - budget) / homogeneous.sum()
+        target = w.copy()
+        target[self.order] = particular - gamma * homogeneous
+        return target, gamma
+
+    def solve(self, risk_tolerance):
+        linear = risk_tolerance * self.mean / self.scale
+        w, status = self.w.copy(), self.status.copy()
+        for _ in range(MVO_MAX_ITERATIONS + 10 * len(w)):
+            free = status == FREE
+            target, gamma = self.free_minimizer(free, w, linear)
+            step = target - w
+            if np.abs(step).max() > MVO_TOLERANCE:
+                # Walk towards the free minimizer until a weight hits a bound
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    room = np.where(step < 0, (self.lower - w) / step, np.where(step > 0, (self.upper - w) / step, np.inf))
+                blocking = np.argmin(room)
+                if room[blocking] >= 1:
+                    w = target
+                    continue
+                w = w + room[blocking] * step
+                w[blocking] = self.lower[blocking] if step[blocking] < 0 else self.upper[blocking]
+                status[blocking] = AT_LOWER if step[blocking] < 0 else AT_UPPER
+                continue
+
+            # At the free minimizer: a bound whose multiplier has the wrong
+            # sign is holding the objective back, release the worst one
+            gradient = self.scaled_cov @ w - linear
+            if gamma is None:
+                # Nothing free, so any gamma between the two sides' implied
+                # multipliers is consistent; take the middle
+                at_lower, at_upper = -gradient[status == AT_LOWER], -gradient[status == AT_UPPER]
+                gamma = (np.max(at_lower, initial=-np.inf) + np.min(at_upper, initial=np.inf)) / 2
+                if not np.isfinite(gamma):
+                    gamma = -np.median(gradient)
+            gradient += gamma
+            violation = np.where(status == AT_LOWER, -gradient, np.where(status == AT_UPPER, gradient, 0))
+            worst = np.argmax(violation)
+            if violation[worst] <= MVO_TOLERANCE:
+                break
+            status[worst] = FREE
+        self.w, self.status = w, status
+        return w.copy()
+
+
+def frontier_point(solver, risk_tolerance):
+    w = solver.solve(risk_tolerance)
+    # With more assets than days the minimum variance is zero, and rounding
+    # can leave it a hair below
+    return w, np.dot(w, solver.mean) * 252, np.sqrt(max(np.dot(w, np.dot(solver.cov, w)), 0) * 252)
+
+
+@profiled
+def efficient_frontier(returns, n_points=FRONTIER_POINTS, min_weight=0.0, max_weight=1.0, universe=None):
+    # Sweeps the risk tolerance from the maximum-return end (found by
+    # doubling until the solution matches the linear-program optimum) down a
+    # geometric grid to the minimum-variance portfolio at zero, each solve
+    # warm-started from its neighbour. Set min_weight below zero to allow
+    # shorting.
+    cov = np.cov(returns, rowvar=False)
+    mean = np.mean(returns, axis=0)
+    solver = MeanVarianceSolver(cov, mean, min_weight, max_weight)
+    best = np.dot(max_return_weights(mean, solver.lower, solver.upper), mean)
+    spread = max(np.ptp(mean), np.finfo(float).tiny)
+
+    # Tolerance at which the return term outweighs the risk term
+    top = solver.scale / spread
+    for _ in range(60):
+        if np.dot(solver.solve(top), mean) >= best - 1e-6 * spread:
+            break
+        top *= 2
+    tolerances = np.append(np.geomspace(top, top * 1e-4, n_points - 1), 0.0)
+
+    points = [frontier_point(solver, t) for t in tolerances]
+    weights, expected, volatility = (np.array(column) for column in zip(*points))
+    index = pd.RangeIndex(n_points, name="Point")
+    return Frontier(
+        pd.DataFrame(weights, index=index, columns=STOCKS if universe is None else universe),
+        pd.Series(expected, index=index, name="Expected Return"),
+        pd.Series(volatility, index=index, name="Volatility"),
+        pd.Series(tolerances, index=index, name="Risk Tolerance"),
+    )
+
+
+@profiled
+def mvo_allocation(returns, target_volatility, min_weight=0.0, max_weight=1.0, universe=None, frontier=None):
+    # Highest-return portfolio whose annualized volatility is at most
+    # target_volatility. The frontier (pass a precomputed one to reuse it)
+    # brackets the target and bisection on the risk tolerance closes in,
+    # warm-starting from the nearer frontier point.
+    if frontier is None:
+        frontier = efficient_frontier(returns, min_weight=min_weight, max_weight=max_weight, universe=universe)
+    columns = frontier.weights.columns
+    volatility = frontier.volatility.values
+    above = np.flatnonzero(volatility > target_volatility)
+    if len(above) == 0:
+        return pd.Series(frontier.weights.values[0], index=columns)
+    if above[-1] == len(volatility) - 1:
+        return pd.Series(frontier.weights.values[-1], index=columns)
+
+    k = above[-1]
+    solver = MeanVarianceSolver(np.cov(returns, rowvar=False), np.mean(returns, axis=0), min_weight, max_weight)
+    w = frontier.weights.values[k + 1]
+    solver.warm_start(w)
+    low, high = frontier.risk_tolerance.values[k + 1], frontier.risk_tolerance.values[k]
+    for _ in range(50):
+        middle = (low + high) / 2
+        candidate, _, candidate_volatility = frontier_point(solver, middle)
+        if candidate_volatility > target_volatility:
+            high = middle
+        else:
+            low, w = middle, candidate
+        if high - low <= 1e-6 * high:
+            break
+    return pd.Series(w, index=columns)
@@ -0,0 +1,137 @@
+# === Timing spans for reruns and hot paths ===
+#
+# A trace covers one unit of work (a Streamlit rerun, a service request) and
+# collects nested spans:
+#
+#   trace = start_trace(session_id, page="robo-advisor")
+#   with span("hrp_allocation"):
+#       ...
+#   finish_trace(trace)
+#
+# Functions decorated with @profiled record a span whenever a trace is active
+# in the calling context and cost one context-variable lookup otherwise.
+# Finished traces are kept in a process-wide ring for summaries and, when
+# RBA_PROFILE_LOG is set, appended to that file as JSON lines.
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+PROFILE_LOG = os.environ.get("RBA_PROFILE_LOG")
+RECENT_TRACES = 500
+
+_current = contextvars.ContextVar("rba_trace", default=None)
+_recent = deque(maxlen=RECENT_TRACES)
+_log_lock = threading.Lock()
+
+
+class Trace:
+    def __init__(self, session_id, **fields):
+        self.session_id = session_id
+        self.fields = fields
+        self.timestamp = time.time()
+        self.start = time.perf_counter()
+        self.spans = []
+        self.depth = 0
+        self.total = None
+        self.token = None
+
+    def to_dict(self):
+        return {
+            "ts": round(self.timestamp, 3),
+            "session": self.session_id,
+            **self.fields,
+            "total_ms": round(self.total * 1000, 3),
+            "spans": [{"name": name, "depth": depth, "start_ms": round(start * 1000, 3), "ms": round(duration * 1000, 3)}
+                      for name, depth, start, duration in self.spans],
+        }
+
+
+def start_trace(session_id, **fields):
+    trace = Trace(session_id, **fields)
+    trace.token = _current.set(trace)
+    return trace
+
+
+def finish_trace(trace, log_path=PROFILE_LOG):
+    trace.total = time.perf_counter() - trace.start
+    _current.reset(trace.token)
+    _recent.append(trace)
+    if log_path:
+        line = json.dumps(trace.to_dict())
+        with _log_lock, open(log_path, "a") as f:
+            f.write(line + "\n")
+    return trace
+
+
+def current_trace():
+    return _current.get()
+
+
+@contextlib.contextmanager
+def span(name):
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    # Spans are stored in start order, so children follow their parent
+    index = len(trace.spans)
+    start = time.perf_counter()
+    trace.spans.append((name, trace.depth, start - trace.start, 0.0))
+    trace.depth += 1
+    try:
+        yield
+    finally:
+        trace.depth -= 1
+        trace.spans[index] = (name, trace.depth, start - trace.start, time.perf_counter() - start)
+
+
+def profiled(name=None):
+    # @profiled or @profiled("label"); the label defaults to the qualified name
+    if callable(name):
+        return profiled()(name)
+
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# numpy and pandas are imported by the display helpers only, so tracing
+# itself adds nothing to start-up
+def trace_frame(trace):
+    # One row per span, indented by nesting depth, for display
+    import pandas as pd
+    return pd.DataFrame({
+        "span": ["  " * depth + name for name, depth, _, _ in trace.spans],
+        "start ms": [start * 1000 for _, _, start, _ in trace.spans],
+        "ms": [duration * 1000 for _, _, _, duration in trace.spans],
+    })
+
+
+def span_summary(traces=None):
+    # Latency percentiles per span name over the recent traces of this
+    # process (every session), slowest p95 first
+    import numpy as np
+    import pandas as pd
+    durations = {}
+    for trace in list(_recent) if traces is None else traces:
+        durations.setdefault("(rerun total)", []).append(trace.total)
+        for name, _, _, duration in trace.spans:
+            durations.setdefault(name, []).append(duration)
+    rows = {name: np.percentile(np.array(values) * 1000, [50, 95, 100]).tolist() + [len(values)]
+            for name, values in durations.items()}
+    summary = pd.DataFrame.from_dict(rows, orient="index", columns=["p50 ms", "p95 ms", "max ms", "count"])
+    summary.index.name = "span"
+    return summary.sort_values("p95 ms", ascending=False)
@@ -0,0 +1,87 @@
+# === Risk metrics for batches of portfolios ===
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from rba.profiling import profiled
+
+RISK_CONFIDENCE = 0.95
+BOOTSTRAP_SAMPLES = 5_000
+# Portfolios per block in the tail estimates, which hold a
+# (portfolios x samples) array each
+RISK_CHUNK_PORTFOLIOS = 1_000
+
+RiskReport = namedtuple("RiskReport", ["summary", "risk_contributions"])
+
+
+def tail_losses(losses, confidence):
+    # VaR is the confidence quantile of the loss distribution (one row per
+    # portfolio, samples along the row) and CVaR the average loss at or
+    # beyond it
+    var = np.quantile(losses, confidence, axis=1)
+    tail = losses >= var[:, None]
+    return var, (losses * tail).sum(axis=1) / tail.sum(axis=1)
+
+
+@profiled
+def risk_metrics(weights, returns, confidence=RISK_CONFIDENCE, horizon_days=1,
+                 bootstrap_samples=BOOTSTRAP_SAMPLES, seed=42, universe=None):
+    # Weights are rows of a (portfolios x assets) matrix, normalized like
+    # simulate_rebalancing's targets. The return history is read once, in
+    # returns @ weights.T; every metric after that works on the (days x
+    # portfolios) matrix of portfolio returns, so the Human, Robo and Bionic
+    # portfolios, or ten thousand clients, cost one pass.
+    #
+    # VaR and CVaR are losses over horizon_days, as positive fractions:
+    # historical from every overlapping window of the history, bootstrap from
+    # bootstrap_samples windows of days drawn with replacement. The same
+    # draws serve every portfolio, so each block of portfolios is one more
+    # product of a (samples x days) count matrix with their log returns.
+    # Risk contributions are each asset's share of portfolio variance.
+    index = weights.index if isinstance(weights, pd.DataFrame) else None
+    if universe is None and isinstance(weights, (pd.Series, pd.DataFrame)):
+        universe = weights.index if isinstance(weights, pd.Series) else weights.columns
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    weights = weights / weights.sum(axis=1, keepdims=True)
+    returns = np.asarray(returns, dtype=float)
+    n_days = len(returns)
+    if not 1 <= horizon_days <= n_days:
+        raise ValueError(f"Horizon of {horizon_days} days does not fit a history of {n_days}")
+
+    portfolio = returns @ weights.T
+    log_growth = np.log1p(portfolio)
+    cumulative = np.vstack([np.zeros(len(weights)), np.cumsum(log_growth, axis=0)])
+
+    volatility = portfolio.std(axis=0, ddof=1) * np.sqrt(252)
+    # Deepest fall from a running peak, starting from the initial $1
+    max_drawdown = -np.expm1((cumulative - np.maximum.accumulate(cumulative, axis=0)).min(axis=0))
+
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(n_days, size=(bootstrap_samples, horizon_days))
+    counts = np.bincount((np.arange(bootstrap_samples)[:, None] * n_days + draws).ravel(),
+                         minlength=bootstrap_samples * n_days).reshape(bootstrap_samples, n_days)
+    counts = counts.astype(float)
+    # Portfolios as rows from here, so each quantile reads contiguous samples
+    windows = (cumulative[horizon_days:] - cumulative[:-horizon_days]).T
+    log_growth = log_growth.T
+    tails = np.empty((4, len(weights)))
+    for start in range(0, len(weights), RISK_CHUNK_PORTFOLIOS):
+        block = slice(start, start + RISK_CHUNK_PORTFOLIOS)
+        tails[:2, block] = tail_losses(-np.expm1(windows[block]), confidence)
+        tails[2:, block] = tail_losses(-np.expm1(log_growth[block] @ counts.T), confidence)
+
+    # w_i (Sigma w)_i / w'Sigma w, each row summing to one
+    marginal = weights @ np.cov(returns, rowvar=False)
+    contributions = weights * marginal
+    contributions /= contributions.sum(axis=1, keepdims=True)
+
+    summary = pd.DataFrame({
+        "Volatility": volatility,
+        "VaR": tails[0],
+        "CVaR": tails[1],
+        "Bootstrap VaR": tails[2],
+        "Bootstrap CVaR": tails[3],
+        "Max Drawdown": max_drawdown,
+    }, index=index)
+    return RiskReport(summary, pd.DataFrame(contributions, index=index, columns=universe))
@@ -0,0 +1,194 @@
+# === Headless allocation service: JSON over HTTP ===
+#
+#   python -m rba.service --port 8765 --workers 4
+#
+#   GET  /health           -> {"status": "ok", "fingerprint": ..., "workers": ...}
+#   POST /allocate         {"age": 30, "horizon": 20, "risk": "Medium", "strategy": "hrp"}
+#   POST /allocate/batch   {"profiles": [{...}, ...]}
+#
+# Requests are parsed on the server's threads and the allocation work runs on
+# a process pool; each worker loads the return data once (a memory-mapped
+# store is shared through the page cache) and keeps its HRP weights.
+import argparse
+import functools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from rba.allocation import RISK_LEVELS, STRATEGIES, batch_allocate, normalized
+from rba.data import LOOKBACK_DAYS, TICKERS, load_returns, returns_fingerprint
+from rba.hrp import hrp_allocation
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+BATCH_CHUNK_PROFILES = 5_000
+
+_returns = None
+
+
+def init_worker(store_path, lookback_days):
+    global _returns
+    _, _, _returns = load_returns(store_path, lookback_days)
+    worker_hrp.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
+def worker_hrp():
+    return hrp_allocation(_returns).values
+
+
+def validate_profiles(profiles):
+    # Checked on the request thread before any work is queued, so a bad body
+    # gets a 400 naming the profile and field rather than a pandas error
+    if not isinstance(profiles, list):
+        raise ValueError("Expected a list of profiles")
+    for i, profile in enumerate(profiles):
+        if not isinstance(profile, dict):
+            raise ValueError(f"Profile {i}: expected an object, got {type(profile).__name__}")
+        strategy = profile.get("strategy", "basic")
+        if not isinstance(strategy, str) or strategy.strip().lower() not in STRATEGIES:
+            raise ValueError(f"Profile {i}: strategy must be one of {STRATEGIES}, got {strategy!r}")
+        strategy = strategy.strip().lower()
+        required = ["horizon"] + (["risk"] if strategy == "basic" else []) + (["age"] if strategy == "bionic" else [])
+        for field in ["horizon", "age"]:
+            value = profile.get(field)
+            if field in required and value is None:
+                raise ValueError(f"Profile {i}: {field!r} is required for the {strategy} strategy")
+            # json.loads accepts NaN and Infinity
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))
+                                      or not math.isfinite(value)):
+                raise ValueError(f"Profile {i}: {field!r} must be a number, got {value!r}")
+        risk = profile.get("risk")
+        if "risk" in required and risk is None:
+            raise ValueError(f"Profile {i}: 'risk' is required for the basic strategy")
+        if risk is not None and not isinstance(risk, str):
+            raise ValueError(f"Profile {i}: 'risk' must be one of {RISK_LEVELS}, got {risk!r}")
+    return profiles
+
+
+def allocate_profiles(profiles):
+    # A profile without a strategy is basic, as when the column is left out
+    frame = pd.DataFrame(profiles)
+    if "strategy" in frame:
+        frame["strategy"] = frame["strategy"].fillna("basic")
+    needs_hrp = "strategy" in frame and (normalized(frame["strategy"]) == "hrp").any()
+    weights, summary = batch_allocate(frame, _returns, worker_hrp() if needs_hrp else None)
+    return [
+        {
+            "weights": dict(zip(TICKERS, row)),
+            "expected_return": expected,
+            "expected_growth_multiple": multiple,
+        }
+        for row, expected, multiple in zip(
+            weights.values.tolist(),
+            summary["Expected Return"].tolist(),
+            summary["Expected Growth Multiple"].tolist(),
+        )
+    ]
+
+
+class AllocationHandler(BaseHTTPRequestHandler):
+    server_version = "RBAService/1.0"
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self.send_json(404, {"error": f"Unknown path {self.path}"})
+        self.send_json(200, {
+            "status": "ok",
+            "fingerprint": self.server.fingerprint,
+            "workers": self.server.workers,
+        })
+
+    def do_POST(self):
+        try:
+            body = self.read_json()
+            if self.path == "/allocate":
+                result = self.server.run(allocate_profiles, validate_profiles([body]))[0]
+            elif self.path == "/allocate/batch":
+                if not isinstance(body, dict) or "profiles" not in body:
+                    raise ValueError('Expected an object with a "profiles" list')
+                profiles = validate_profiles(body["profiles"])
+                chunks = [profiles[i:i + BATCH_CHUNK_PROFILES]
+                          for i in range(0, len(profiles), BATCH_CHUNK_PROFILES)]
+                result = {"results": [item for chunk in self.server.map(allocate_profiles, chunks) for item in chunk]}
+            else:
+                return self.send_json(404, {"error": f"Unknown path {self.path}"})
+        except (KeyError, TypeError, ValueError) as e:
+            return self.send_json(400, {"error": f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            # Anything else is a server fault, but the client still gets an answer
+            return self.send_json(500, {"error": f"{type(e).__name__}: {e}"})
+        self.send_json(200, result)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length > MAX_BODY_BYTES:
+            raise ValueError(f"Request body over {MAX_BODY_BYTES} bytes")
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class AllocationServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, store_path=None, lookback_days=LOOKBACK_DAYS, workers=os.cpu_count(), verbose=False):
+        super().__init__(address, AllocationHandler)
+        self.workers = workers
+        self.verbose = verbose
+        # workers=0 runs allocations on the request threads, which suits
+        # development and embedding
+        init_worker(store_path, lookback_days)
+        self.fingerprint = returns_fingerprint(_returns)
+        self.pool = ProcessPoolExecutor(workers, initializer=init_worker,
+                                        initargs=(store_path, lookback_days)) if workers else None
+
+    def run(self, fn, *args):
+        return self.pool.submit(fn, *args).result() if self.pool else fn(*args)
+
+    def map(self, fn, items):
+        return list(self.pool.map(fn, items)) if self.pool else [fn(item) for item in items]
+
+    def server_close(self):
+        super().server_close()
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve robo-advisor allocations over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="allocation worker processes (0 runs them on the request threads)")
+    parser.add_argument("--store", default=os.environ.get("RBA_RETURNS_STORE"),
+                        help="returns store directory (default: $RBA_RETURNS_STORE, else synthetic data)")
+    parser.add_argument("--lookback-days", type=int, default=int(os.environ.get("RBA_LOOKBACK_DAYS", LOOKBACK_DAYS)))
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = AllocationServer((args.host, args.port), args.store, args.lookback_days, args.workers, args.verbose)
+    print(f"Serving allocations on http://{args.host}:{server.server_address[1]} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# === Stress scenarios: hypothetical shocks and historical windows ===
+#
+# A scenario is one simple return per asset over the whole shock. The library
+# holds hand-set shocks for the demo tickers, the named historical episodes
+# the loaded history covers, and every rolling window of it, which gives a
+# P&L distribution from the data itself. Applying (scenarios x assets)
+# shocks to (portfolios x assets) weights is one product per block of
+# portfolios.
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from rba.data import TICKERS
+from rba.profiling import profiled
+
+# Shocks in percent, one column per HYPOTHETICAL_TICKERS. Calibrated on the
+# episodes' peak-to-trough moves, with stand-ins for the names that were not
+# yet listed.
+HYPOTHETICAL_TICKERS = list(TICKERS)
+HYPOTHETICAL_SCENARIOS = ["2008 financial crisis", "2020 COVID crash", "2022 rate spike", "Tech selloff", "Oil shock"]
+HYPOTHETICAL_SHOCKS = np.array([
+    [-50, -40, -45, -60, -60, -55, -20, -25, -40, -50],
+    [-31, -28, -13, -60, -35, -43, -25, -50, -29, -34],
+    [-27, -29, -50, -65, -50, -15, 3, 80, 4, -64],
+    [-35, -30, -40, -50, -55, -5, 2, 5, -8, -45],
+    [-8, -6, -10, -12, -10, -12, -4, 35, -6, -9],
+]) / 100
+# (name, first day, last day), used when the history has dates covering them
+HISTORICAL_WINDOWS = [
+    ("Lehman to the 2009 low", "2008-09-12", "2009-03-09"),
+    ("COVID crash", "2020-02-19", "2020-03-23"),
+    ("2022 rate hikes", "2022-01-03", "2022-10-12"),
+]
+ROLLING_WINDOW_DAYS = 21
+STRESS_PERCENTILES = [5, 25, 50, 75, 95]
+# Portfolios per block: each holds a (scenarios x portfolios) float32 P&L
+STRESS_CHUNK_PORTFOLIOS = 10_000
+# Bins of the across-portfolio P&L histograms behind the per-scenario
+# percentiles: 0.1% wide from -100% to +200%
+STRESS_BIN_WIDTH = 0.001
+STRESS_BINS = 3000
+
+# kinds: "hypothetical", "historical" or "rolling" per scenario
+Scenarios = namedtuple("Scenarios", ["names", "kinds", "shocks"])
+StressResult = namedtuple("StressResult", ["portfolios", "scenarios", "pnl"])
+
+
+def window_shocks(cumulative, starts, stops):
+    # Compounded asset returns over rows [start, stop), from cumulative log
+    # growth with a leading row of zeros
+    return np.expm1(cumulative[stops] - cumulative[starts])
+
+
+def scenario_library(history=None, dates=None, tickers=None, rolling_days=ROLLING_WINDOW_DAYS, hypothetical=True):
+    # Hypothetical shocks (when `tickers`, naming the history's columns, are
+    # HYPOTHETICAL_TICKERS in order, or there is no history), then the
+    # historical windows the dated history covers, then every rolling_days
+    # window of the history (0 for none)
+    names, kinds, shocks = [], [], []
+    if hypothetical and (history is None or (tickers is not None and list(tickers) == HYPOTHETICAL_TICKERS)):
+        names += HYPOTHETICAL_SCENARIOS
+        kinds += ["hypothetical"] * len(HYPOTHETICAL_SCENARIOS)
+        shocks.append(HYPOTHETICAL_SHOCKS)
+    if history is None:
+        return Scenarios(names, kinds, np.vstack(shocks))
+    cumulative = np.vstack([np.zeros(history.shape[1]), np.cumsum(np.log1p(np.asarray(history, dtype=float)), axis=0)])
+    if dates is not None:
+        dates = np.asarray(dates, dtype="datetime64[D]")[-len(history):]
+        for name, first, last in HISTORICAL_WINDOWS:
+            first, last = np.datetime64(first, "D"), np.datetime64(last, "D")
+            if dates[0] <= first and dates[-1] >= last:
+                # From the close of the first day to the close of the last
+                start = np.searchsorted(dates, first, side="right")
+                stop = np.searchsorted(dates, last, side="right")
+                names.append(name)
+                kinds.append("historical")
+                shocks.append(window_shocks(cumulative, np.array([start]), np.array([stop])))
+    if rolling_days and len(history) >= rolling_days:
+        starts = np.arange(len(history) - rolling_days + 1)
+        labels = dates[starts + rolling_days - 1].astype(str) if dates is not None else starts + rolling_days
+        names += [f"{rolling_days} days to {label}" for label in labels]
+        kinds += ["rolling"] * len(starts)
+        shocks.append(window_shocks(cumulative, starts, starts + rolling_days))
+    return Scenarios(names, kinds, np.vstack(shocks) if shocks else np.empty((0, history.shape[1])))
+
+
+@profiled
+def stress_test(weights, shocks, names=None, record=False):
+    # P&L as a fraction of the portfolio: (scenarios x assets) shocks applied
+    # to weights normalized like simulate_rebalancing's targets, one float32
+    # product per block of portfolios. Per portfolio: the worst loss and its
+    # scenario, and percentiles of P&L across scenarios. Per scenario: the
+    # mean, worst and percentiles across portfolios (the latter read from a
+    # histogram at STRESS_BIN_WIDTH resolution, so that 100k portfolios need
+    # not be held at once). record=True also returns the whole P&L matrix.
+    index = weights.index if isinstance(weights, pd.DataFrame) else None
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    weights = (weights / weights.sum(axis=1, keepdims=True)).astype(np.float32)
+    shocks = np.atleast_2d(np.asarray(shocks, dtype=np.float32))
+    names = list(range(len(shocks))) if names is None else list(names)
+    n_scenarios, n_portfolios = len(shocks), len(weights)
+
+    worst = np.empty(n_portfolios)
+    worst_scenario = np.empty(n_portfolios, dtype=int)
+    percentiles = np.empty((len(STRESS_PERCENTILES), n_portfolios))
+    scenario_sum = np.zeros(n_scenarios)
+    scenario_worst = np.full(n_scenarios, np.inf)
+    counts = np.zeros(n_scenarios * STRESS_BINS, dtype=np.int64)
+    bin_offsets = (np.arange(n_scenarios) * STRESS_BINS)[:, None]
+    pnl_matrix = np.empty((n_scenarios, n_portfolios), dtype=np.float32) if record else None
+
+    for start in range(0, n_portfolios, STRESS_CHUNK_PORTFOLIOS):
+        block = slice(start, start + STRESS_CHUNK_PORTFOLIOS)
+        pnl = shocks @ weights[block].T
+        if record:
+            pnl_matrix[:, block] = pnl
+        worst_scenario[block] = pnl.argmin(axis=0)
+        worst[block] = pnl.min(axis=0)
+        percentiles[:, block] = np.percentile(pnl, STRESS_PERCENTILES, axis=0)
+        scenario_sum += pnl.sum(axis=1)
+        np.minimum(scenario_worst, pnl.min(axis=1), out=scenario_worst)
+        bins = np.clip(((pnl + 1) / STRESS_BIN_WIDTH).astype(np.int64), 0, STRESS_BINS - 1)
+        counts += np.bincount((bins + bin_offsets).ravel(), minlength=n_scenarios * STRESS_BINS)
+
+    portfolios = pd.DataFrame({
+        "Worst Loss": -worst,
+        "Worst Scenario": np.array(names, dtype=object)[worst_scenario],
+        **{f"P{p}": row for p, row in zip(STRESS_PERCENTILES, percentiles)},
+    }, index=index)
+    # Per scenario, the first bin whose cumulative count reaches each
+    # percentile, reported at its midpoint
+    cumulative = counts.reshape(n_scenarios, STRESS_BINS).cumsum(axis=1)
+    targets = np.array(STRESS_PERCENTILES) / 100 * n_portfolios
+    positions = np.stack([np.argmax(cumulative >= max(t, 1), axis=1) for t in targets], axis=1)
+    scenarios = pd.DataFrame((positions + 0.5) * STRESS_BIN_WIDTH - 1,
+                             index=pd.Index(names, name="Scenario"),
+                             columns=[f"P{p}" for p in STRESS_PERCENTILES])
+    scenarios.insert(0, "Mean", scenario_sum / n_portfolios)
+    scenarios.insert(1, "Worst", scenario_worst)
+    pnl = None
+    if record:
+        pnl = pd.DataFrame(pnl_matrix, index=pd.Index(names, name="Scenario"), columns=index)
+    return StressResult(portfolios, scenarios, pnl)
@@ -0,0 +1,120 @@
+# === HRP sweeps: many universes, windows and linkage methods over a process pool ===
+#
+#   jobs = sweep_grid({"tech": ["AAPL", "MSFT", "NVDA"], "all": TICKERS},
+#                     {"1y": (None, None, 252), "2022": ("2022-01-01", "2022-12-31", None)},
+#                     ["single", "ward"])
+#   table = hrp_sweep(jobs, open_returns_store(path))
+#
+# The return panel is shared with the workers rather than pickled into every
+# job: a ReturnsStore is opened by path in each worker, so its memory-mapped
+# pages come from the OS page cache, and an in-memory panel is copied once
+# into a shared-memory block that every worker maps. A job only carries
+# column indices, a row range and a method.
+import itertools
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from rba.data import TICKERS, ReturnsStore, open_returns_store, window_rows
+from rba.hrp import LINKAGE_METHODS, hrp_allocation
+from rba.jobs import JOB_WORKERS
+from rba.profiling import profiled
+
+# window: (start, end, days) as in ReturnsStore.window
+SweepJob = namedtuple("SweepJob", ["universe", "tickers", "window", "start", "end", "days", "method"])
+
+# The panel this worker process reads, set by attach_panel
+_panel = None
+_shared = None
+
+
+def sweep_grid(universes, windows, methods=LINKAGE_METHODS):
+    # Every combination of {name: tickers}, {name: (start, end, days)} and
+    # linkage methods
+    return [SweepJob(universe, tuple(tickers), window, *bounds, method)
+            for (universe, tickers), (window, bounds), method
+            in itertools.product(universes.items(), windows.items(), methods)]
+
+
+def attach_panel(source):
+    # Pool initializer: a store path, or (name, shape, dtype) of a shared block
+    global _panel, _shared
+    if isinstance(source, str):
+        _panel = open_returns_store(source).returns
+        return
+    name, shape, dtype = source
+    # Pool workers share the parent's resource tracker, so attaching does
+    # not take ownership; the parent unlinks the block after the sweep
+    _shared = SharedMemory(name=name)
+    _panel = np.ndarray(shape, dtype=dtype, buffer=_shared.buf)
+
+
+def run_sweep_job(columns, first, last, method, shrinkage, panel=None):
+    # (weights, seconds, worker pid) for one job on `panel`, by default the
+    # one attached to this worker
+    start = time.perf_counter()
+    panel = _panel if panel is None else panel
+    returns = np.asarray(panel[first:last][:, columns], dtype=np.float64)
+    weights = hrp_allocation(returns, method, universe=range(len(columns)), shrinkage=shrinkage).values
+    return weights, time.perf_counter() - start, os.getpid()
+
+
+@profiled
+def hrp_sweep(jobs, returns, tickers=TICKERS, dates=None, workers=JOB_WORKERS, shrinkage=None):
+    # HRP weights of every job, as one tidy table with a row per job and
+    # ticker and each job's compute time. `returns` is a ReturnsStore (its
+    # tickers and dates are used) or a (days x tickers) array with `tickers`
+    # naming its columns and optional `dates`. workers=0 runs the jobs in
+    # this process.
+    if isinstance(returns, ReturnsStore):
+        tickers, dates, source = returns.tickers, returns.dates, returns.path
+        panel = returns.returns
+    else:
+        panel = np.ascontiguousarray(returns)
+        source = None
+    ticker_index = {ticker: i for i, ticker in enumerate(tickers)}
+
+    tasks = []
+    for job in jobs:
+        missing = [ticker for ticker in job.tickers if ticker not in ticker_index]
+        if missing:
+            raise ValueError(f"Universe {job.universe!r}: unknown tickers {missing}")
+        if job.method not in LINKAGE_METHODS:
+            raise ValueError(f"Unknown linkage method {job.method!r}; expected one of {LINKAGE_METHODS}")
+        first, last = window_rows(panel.shape[0], dates, job.start, job.end, job.days)
+        if last - first < 2:
+            raise ValueError(f"Window {job.window!r} holds {max(last - first, 0)} rows; need at least two")
+        tasks.append(([ticker_index[ticker] for ticker in job.tickers], first, last, job.method, shrinkage))
+
+    shared = None
+    try:
+        if workers == 0:
+            results = [run_sweep_job(*task, panel=panel) for task in tasks]
+        else:
+            if source is None:
+                shared = SharedMemory(create=True, size=max(panel.nbytes, 1))
+                np.ndarray(panel.shape, dtype=panel.dtype, buffer=shared.buf)[:] = panel
+                source = (shared.name, panel.shape, panel.dtype.str)
+            with ProcessPoolExecutor(workers, initializer=attach_panel, initargs=(source,)) as executor:
+                chunksize = max(1, len(tasks) // (4 * workers))
+                results = list(executor.map(run_sweep_job, *zip(*tasks), chunksize=chunksize))
+    finally:
+        if shared is not None:
+            shared.close()
+            shared.unlink()
+
+    rows = []
+    for k, (job, (columns, first, last, _, _), (weights, seconds, worker)) in enumerate(zip(jobs, tasks, results)):
+        window_dates = (dates[first], dates[last - 1]) if dates is not None else (first, last - 1)
+        rows.append(pd.DataFrame({
+            "job": k, "universe": job.universe, "window": job.window, "method": job.method,
+            "first": window_dates[0], "last": window_dates[1], "days": last - first,
+            "ticker": list(job.tickers), "weight": weights, "seconds": seconds, "worker": worker,
+        }))
+    columns = ["job", "universe", "window", "method", "first", "last", "days", "ticker", "weight", "seconds", "worker"]
+    return pd.concat(rows, ignore_index=True) if rows else pd.DataFrame(columns=columns)
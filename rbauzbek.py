@@ -1,605 +1,818 @@
-# === Streamlit Robo-Advisor Full Site with Proper Tabs ===
-import streamlit as st
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
-import scipy.cluster.hierarchy as sch
-
-# ============ PAGE SETTING ============
-st.set_page_config(page_title="Robo-Advisor with Dr. Danial!", layout="wide")
-st.title("🔮 Experience Robo-Advisor with Dr. Danial!")
-
-# ============ DATA PREPARATION ============
-stocks = [
-    'Apple (AAPL)', 'Microsoft (MSFT)', 'Amazon (AMZN)', 'Tesla (TSLA)', 'Nvidia (NVDA)',
-    'JPMorgan Chase (JPM)', 'Johnson & Johnson (JNJ)', 'ExxonMobil (XOM)',
-    'Berkshire Hathaway (BRK.B)', 'Meta Platforms (META)'
-]
-
-np.random.seed(42)
-returns = np.random.randn(252, len(stocks)) / 100
-
-# ============ FUNCTIONS ============
-
-def get_cluster_variance(cov, cluster):
-    idx = [stocks.index(stock) for stock in cluster]
-    cov_slice = cov[np.ix_(idx, idx)]
-    w = np.repeat(1/len(cluster), len(cluster))
-    return np.dot(w, np.dot(cov_slice, w))
-
-def hrp_allocation(returns):
-    cov = np.cov(returns, rowvar=False)
-    corr = np.corrcoef(returns, rowvar=False)
-    dist = np.sqrt(0.5 * (1 - corr))
-    linkage = sch.linkage(dist, method='single')
-    sorted_idx = sch.leaves_list(linkage)
-    
-    weights = pd.Series(1, index=[stocks[i] for i in sorted_idx])
-    cluster_items = [[stocks[i] for i in sorted_idx]]
-    
-    while len(cluster_items) > 0:
-        cluster_items = [i for i in cluster_items if len(i) > 1]
-        if len(cluster_items) == 0:
-            break
-        new_cluster = []
-        for cluster in cluster_items:
-            split = len(cluster) // 2
-            left, right = cluster[:split], cluster[split:]
-            left_var = get_cluster_variance(cov, left)
-            right_var = get_cluster_variance(cov, right)
-            alpha = 1 - left_var / (left_var + right_var)
-            weights[left] *= alpha
-            weights[right] *= (1 - alpha)
-            new_cluster += [left, right]
-        cluster_items = new_cluster
-    return weights / weights.sum()
-
-def basic_allocation(risk):
-    if risk == "Low":
-        stocks_pct = [13, 13, 13, 6, 7, 11, 13, 13, 11, 0]
-    elif risk == "Medium":
-        stocks_pct = [10, 10, 10, 10, 10, 10, 10, 10, 10, 10]
-    else:
-        stocks_pct = [6, 6, 8, 15, 18, 8, 7, 8, 8, 6]
-    stocks_pct = np.array(stocks_pct)
-    stocks_pct = stocks_pct / stocks_pct.sum()
-    return pd.Series(stocks_pct, index=stocks)
-
-def smart_bionic_strategy(age, years):
-    if age < 30:
-        return [15, 14, 13, 10, 10, 8, 6, 6, 9, 9]
-    elif age < 50:
-        return [12, 12, 10, 8, 8, 10, 10, 10, 10, 10]
-    else:
-        return [10, 10, 8, 6, 6, 12, 14, 14, 10, 10]
-
-def plot_portfolio_pie(weights, title):
-    pastel_colors = ["#A2C4C9", "#C9DAF8", "#D9EAD3", "#F9CB9C", "#FFE599",
-                     "#B6D7A8", "#CFE2F3", "#EAD1DC", "#F6B26B", "#B4A7D6"]
-    fig = px.pie(
-        names=weights.index,
-        values=weights * 100,
-        hole=0.45,
-        color_discrete_sequence=pastel_colors
-    )
-    fig.update_traces(
-        textinfo='label+percent',
-        textposition='inside',
-        insidetextorientation='radial',
-        pull=[0.02]*len(weights)
-    )
-    fig.update_layout(
-        height=600, width=600,
-        showlegend=False,
-        title_text=title,
-        title_x=0.5,
-        margin=dict(t=40, b=40, l=40, r=40)
-    )
-    st.plotly_chart(fig, use_container_width=False)
-
-def plot_growth(initial_investment, expected_return, years, key_growth):
-    values = [initial_investment * (1 + expected_return) ** year for year in range(years + 1)]
-    max_val = max(values)
-    fig, ax = plt.subplots(figsize=(7,5))
-    ax.plot(range(years + 1), values, marker='o')
-    ax.set_xlabel("Year")
-    ax.set_ylabel("Portfolio Value ($)")
-    ax.set_title("Projected Portfolio Growth")
-    ax.text(years-3, max_val * 0.95, f"Max: ${max_val:,.0f}", ha='center', va='bottom', fontsize=10, color='green')
-    st.pyplot(fig, clear_figure=True)
-
-# ============ TAB SETUP ============
-tabs = st.tabs(["About Me", "What is Robo Advisor?", "The Roots of Robo Advisor", "How it Works?", "Who Uses Robo Advisor?", "Human Advisor", "Robo Advisor", "Bionic Advisor", "Conclusion", "Group Activities"])
-
-
-# === ABOUT ME TAB ===
-with tabs[0]:
-    col1, col2 = st.columns([1, 3])
-    with col1:
-        st.image("ARA-0925.jpg", width=400)
-    with col2:
-        st.subheader("👤 About Dr. Ahmad Danial Zainudin, PhD, CFTe")
-        st.markdown("""
-*Finance academician with strong integration of industry experience and scholarly engagement.*
-
-👨🏻‍💼 **Professional Experience**  
-- Held various derivatives trading positions in Phillip Futures, Maybank Investment Bank, and CIMB Investment Bank.  
-- Certified Financial Technician (CFTe) with experience in **investment**, **markets**, and **hedging strategies**.
-
-🏛️ **Academic Leadership and Teaching Focus**  
-- Senior Lecturer and Programme Leader for **Master in Finance** at **Asia Pacific University**.  
-- Teaching fixed income and equity investment, financial management, international banking and investment, robo-advisor, and FinTech using Python.
-
-🔬 **Research Interests**  
-- Computational Finance  
-- Automated Asset Allocations and Hedging Strategies  
-- Econophysics and Market Microstructure
-
-🏆 **Recognitions**  
-- Top Futures Broker (Bursa Malaysia)  
-- Maybank Staff Academic Award  
-- IVIC Bronze Medal.
-""")
-
-    # Centered Signature
-    st.markdown(
-    """
-    <div style='text-align: center; font-size: 14px; color: grey; margin-top: 50px;'>
-        <strong>Dr. Ahmad Danial bin Zainudin </strong><br>
-        School of Accounting & Finance | Asia Pacific University of Technology & Innovation (Malaysia) <br>
-        danial.zainudin@apu.edu.my
-    </div>
-    """, unsafe_allow_html=True
-    )
-
-# === WHAT IS ROBO ADVISOR ===
-with tabs[1]:
-    st.markdown("<h2 style='font-size:26px; color:black;'>📚 What is a Robo-Advisor?</h2>", unsafe_allow_html=True)
-
-    st.markdown("---")
-
-    with st.expander("1. 📖 Introduction to Robo-Advisors"):
-        st.markdown("""
-<div style='font-size:16px; color:black;'>
-- <b>Robo-Advisors</b> = <i>Automation + Investment Intelligence</i>.<br>
-- Digital platforms offering <b>automated, algorithm-driven</b> financial planning and investing services.<br>
-- Require <b>minimal human supervision</b> compared to traditional advisors.<br>
-- Aim to make <b>professional-grade investment management</b> affordable and accessible to <b>everyone</b>, not just the wealthy.<br><br>
-
-🔵 <b>In short:</b><br>
-<b>Robo-Advisors = Your smart financial manager, available 24/7, without emotional bias.</b>
-</div>
-""", unsafe_allow_html=True)
-
-    with st.expander("2. 🏛️ What is Digital Investment Management (DIM)?"):
-        st.markdown("""
-<div style='font-size:16px; color:black;'>
-- <b>DIM</b> is the technological backbone powering Robo-Advisors.<br>
-- It automates the entire investment journey:<br>
-    - Client onboarding and profiling<br>
-    - Risk appetite analysis<br>
-    - Portfolio construction and asset allocation<br>
-    - Continuous monitoring and automatic rebalancing<br>
-    - Transparent reporting and updates<br><br>
-
-✅ <b>DIM replaces manual wealth management with data, algorithms, and AI-driven intelligence.</b>
-</div>
-""", unsafe_allow_html=True)
-
-    with st.expander("3. 🔄 How Do Robo-Advisors Work? (Simple Workflow)"):
-        st.markdown("""
-<div style='font-size:16px; color:black;'>
-1. <b>You answer a simple questionnaire</b> (age, goals, risk comfort, investment timeline).<br>
-2. <b>Algorithm constructs a diversified portfolio</b> tailored to your profile.<br>
-3. <b>Ongoing monitoring and auto-rebalancing</b> to maintain optimal allocation.<br>
-4. <b>Transparent, real-time reporting</b> keeps you updated on performance and risks.<br><br>
-
-✅ <b>No guessing. No emotions. Just disciplined, data-driven investing!</b>
-</div>
-""", unsafe_allow_html=True)
-
-    with st.expander("4. 🎯 Benefits of Robo-Advisors"):
-        st.markdown("""
-<div style='font-size:16px; color:black;'>
-- <b>Low Costs:</b>  
-  Robo-Advisors charge significantly lower management fees compared to traditional human advisors.<br>
-- <b>Accessibility:</b>  
-  Start investing with as little as <b>$100 or less</b>.<br>
-- <b>Automatic Diversification:</b>  
-  Investments spread across different asset classes to minimize risk.<br>
-- <b>Emotion-Free Investing:</b>  
-  Algorithms make decisions logically, free from panic or greed.<br>
-- <b>Continuous Optimization:</b>  
-  Portfolios auto-adjust to reflect changing market conditions.<br>
-- <b>Transparent Fees and Reporting:</b>  
-  Easy-to-understand breakdowns of costs and portfolio performance.<br><br>
-
-✅ <b>Professional wealth management, accessible without needing to be a financial expert!</b>
-</div>
-""", unsafe_allow_html=True)
-
-    with st.expander("5. ⚖️ Limitations"):
-        st.markdown("""
-<div style='font-size:16px; color:black;'>
-- <b>Limited Personalization:</b>  
-  Algorithms may struggle with highly complex or specialized financial needs.<br>
-- <b>Model Risk:</b>  
-  Over-reliance on historical assumptions may underperform during market shocks.<br>
-- <b>Regulatory Evolution:</b>  
-  Regulations for digital investment services are still evolving in many countries.<br><br>
-
-🎯 <b>Bottom Line:</b><br>
-<b>Robo-Advisors are ideal for most investors, but for complex cases, human advisors may still add value.</b>
-</div>
-""", unsafe_allow_html=True)
-
-    st.success("✅ **Robo-Advisors represent the future: affordable, intelligent, and emotion-free wealth management for all investors! 🚀**")
-
-    st.markdown("---")
-
-    # Centered Signature
-    st.markdown(
-    """
-    <div style='text-align: center; font-size: 13px; color: grey; margin-top: 30px;'>
-        <strong>Dr. Ahmad Danial bin Zainudin</strong><br>
-        School of Accounting & Finance | Asia Pacific University of Technology & Innovation (Malaysia)<br>
-        danial.zainudin@apu.edu.my
-    </div>
-    """, unsafe_allow_html=True
-    )
-
-# === THE ROOTS OF ROBO ADVISOR ===
-with tabs[2]:
-    st.markdown("<h2 style='font-size:26px; color:black;'>📜 Evolution of Robo-Advisory: From Theory to Automation</h2>", unsafe_allow_html=True)
-
-    st.markdown("<h3 style='font-size:20px; color:black;'>🧠 Birth of Investment Science (1952)</h3>", unsafe_allow_html=True)
-    st.markdown("""
-- **Harry Markowitz** introduced **Modern Portfolio Theory (MPT)**.
-- Shifted investing from stock-picking to **portfolio optimization**.
-- Introduced the concept of the **risk-return frontier** and **diversification principles**.
-""")
-
-    st.markdown("<h3 style='font-size:20px; color:black;'>💻 Rise of Financial Computing (1970s–1990s)</h3>", unsafe_allow_html=True)
-    st.markdown("""
-- Rise of **financial simulations**, **MVO (Mean-Variance Optimization)**, and **algorithmic trading**.
-- Increased use of **mathematical modeling** in portfolio management.
-""")
-
-    st.markdown("<h3 style='font-size:20px; color:black;'>🌍 Trust Crisis (Post-2008)</h3>", unsafe_allow_html=True)
-    st.markdown("""
-- Following the **Global Financial Crisis (2008)**, investor trust declined.
-- Demands for **transparency**, **low costs**, and **emotion-free investing** surged.
-- Paved the way for the emergence of **Robo-Advisory platforms**.
-""")
-
-    st.markdown("<h3 style='font-size:20px; color:black;'>🚀 Maturity and Rise of Robo-Advisory (2008 Onwards)</h3>", unsafe_allow_html=True)
-    st.markdown("""
-- **Betterment** and **Wealthfront** emerged as pioneers of **digital wealth advisory**, making automated investing accessible to everyday investors.
-- Embedded sophisticated financial models into user-friendly platforms:
-  - **Modern Portfolio Theory (MPT):** Optimize returns relative to risk.
-  - **Black-Litterman Model:** Blend market consensus with personalized views.
-  - **Hierarchical Risk Parity (HRP):** Balance portfolio risks without relying on unstable correlations.
-- The marriage of **automation** and **algorithmic intelligence** redefined wealth management.
-- Democratized access to professional-grade investment strategies once reserved for the ultra-wealthy.
-""")
-
-    st.success("✅ Robo-Advisory is the natural evolution of decades of financial innovation.")
-
-    st.markdown(
-    """
-    <div style='text-align: center; font-size: 13px; color: grey; margin-top: 50px;'>
-        <strong>Dr. Ahmad Danial bin Zainudin</strong><br>
-        School of Accounting & Finance | Asia Pacific University of Technology & Innovation (Malaysia)<br>
-        danial.zainudin@apu.edu.my
-    </div>
-    """, unsafe_allow_html=True
-    )
-
-# === HOW IT WORKS ===
-with tabs[3]:
-    st.markdown("<h2 style='text-align:left; font-size:28px; color:black;'>How Does a Robo-Advisor Work?</h2>", unsafe_allow_html=True)
-
-    st.markdown("<h3 style='font-size:22px; color:black;'>Step 1: Creating Your Investment Policy Statement (IPS)</h3>", unsafe_allow_html=True)
-    st.markdown("""
-<div style='font-size:16px; color:black;'>
-<ul>
-<li><b>Age</b> and <b>Investment Horizon</b></li>
-<li><b>Risk Tolerance</b> (Low, Medium, High)</li>
-<li><b>Financial Goals</b> (e.g., Retirement, Home Purchase, Education)</li>
-<li><b>Liquidity Needs</b> and <b>Time Preferences</b></li>
-</ul>
-
-<p style='font-size:14px;'>👉 The IPS acts as your personal investment blueprint — guiding portfolio construction and future rebalancing!</p>
-</div>
-""", unsafe_allow_html=True)
-
-    st.markdown("---")
-
-    st.markdown("<h3 style='font-size:22px; color:black;'>Step 2: Designing the Ideal Portfolio (ICM Mix)</h3>", unsafe_allow_html=True)
-    st.markdown("""
-<div style='font-size:16px; color:black;'>
-<b>Based on your IPS, Robo-Advisors build a diversified portfolio using:</b>
-<ul>
-<li><b>Stocks</b> — for growth potential</li>
-<li><b>Bonds</b> — for stability and income</li>
-<li><b>Cash</b> — for liquidity</li>
-<li><b>Alternatives</b> (e.g., Real Estate, Commodities)</li>
-</ul>
-
-⚡ <b>Objective:</b> Find the right balance between maximizing returns and minimizing risks.
-</div>
-""", unsafe_allow_html=True)
-
-    st.markdown("---")
-
-    st.markdown("<h3 style='font-size:22px; color:black;'>Step 3: Intelligent Optimization Models</h3>", unsafe_allow_html=True)
-    st.markdown("""
-<div style='font-size:16px; color:black;'>
-
-<b>Mean-Variance Optimization (MVO)</b><br>
-- Seeks the best risk-return combination by balancing expected returns and portfolio volatility.<br><br>
-
-<b>Generalized Reduced Gradient (GRG)</b><br>
-- Solves optimization problems when portfolios have multiple real-world constraints (like minimum or maximum weightings).<br><br>
-
-<b>Hierarchical Risk Parity (HRP)</b><br>
-- Clusters similar assets and allocates risks intelligently across them.<br>
-- Especially powerful during volatile markets when asset correlations become unstable.
-
-</div>
-""", unsafe_allow_html=True)
-
-    st.markdown("---")
-
-    st.markdown("<h3 style='font-size:22px; color:black;'>Step 4: Continuous Monitoring & Rebalancing</h3>", unsafe_allow_html=True)
-    st.markdown("""
-<div style='font-size:16px; color:black;'>
-<ul>
-<li><b>Market fluctuations</b> can cause your portfolio to drift from its target allocation.</li>
-<li><b>Automatic rebalancing</b> ensures your portfolio stays aligned with your risk profile.</li>
-<li><b>Emotion-free investing:</b> Avoid panic selling or greedy overexposure.</li>
-</ul>
-
-✅ Investing made smarter, simpler, and truly dynamic.
-</div>
-""", unsafe_allow_html=True)
-
-    st.markdown("---")
-
-    # Centered Signature
-    st.markdown(
-    """
-    <div style='text-align: center; font-size: 13px; color: white; margin-top: 30px;'>
-        <strong>Dr. Ahmad Danial bin Zainudin</strong><br>
-        School of Accounting & Finance | Asia Pacific University of Technology & Innovation (Malaysia)<br>
-        danial.zainudin@apu.edu.my
-    </div>
-    """, unsafe_allow_html=True
-    )
-
-# === WHO USES ROBO ADVISOR ===
-with tabs[4]:
-    st.markdown("<h2 style='font-size:26px; color:black;'>👥 Who Uses Robo-Advisors?</h2>", unsafe_allow_html=True)
-
-    st.markdown("""
-<div style='font-size:16px; color:black;'>
-
-- 👨‍🎓 <b>Young Professionals:</b><br>
-  Just starting their careers, aiming to build wealth systematically at low cost.<br><br>
-
-- 👩‍💼 <b>Busy Executives:</b><br>
-  Prefer automated, hands-off investment management while focusing on their demanding careers.<br><br>
-
-- 👵 <b>Retirees:</b><br>
-  Seeking stable income streams and conservative risk-managed portfolios.<br><br>
-
-- 🏢 <b>Small Businesses and SMEs:</b><br>
-  Managing idle cash reserves through low-cost, diversified portfolios.<br><br>
-
-- 🌍 <b>Global Citizens:</b><br>
-  Investors seeking easy cross-border access to diversified international markets.<br><br>
-
-- 🏦 <b>Institutional Players (Pensions, Endowments, Foundations):</b><br>
-  Utilizing robo-platforms for niche mandates (e.g., cash management, ESG portfolios, or tactical allocations) to complement traditional strategies.<br><br>
-
-✅ <b>Common Theme:</b><br>
-👉 Desire for simplicity, lower fees, transparency, and emotion-free investment discipline.
-
-</div>
-""", unsafe_allow_html=True)
-
-    st.markdown("---")
-    st.success("✅ Robo-Advisory adoption is accelerating across individuals, businesses, and even institutional segments!")
-
-    st.markdown(
-    """
-    <div style='text-align: center; font-size: 13px; color: grey; margin-top: 30px;'>
-        <strong>Dr. Ahmad Danial bin Zainudin</strong><br>
-        School of Accounting & Finance | Asia Pacific University of Technology & Innovation (Malaysia)<br>
-        danial.zainudin@apu.edu.my
-    </div>
-    """, unsafe_allow_html=True
-    )
-
-# === HUMAN ADVISOR TAB ===
-with tabs[5]:
-    st.subheader("👤 Human Advisor (100% human decision)")
-
-    age_human = st.number_input("Enter your age:", min_value=18, max_value=100, value=30, key="age_human")
-    risk = st.selectbox("Select your risk tolerance:", ["Low", "Medium", "High"], key="risk_human")
-
-    weights = basic_allocation(risk)
-
-    col1, col2 = st.columns([1, 1])
-    with col1:
-        st.markdown("### Human Advisor Portfolio")
-        plot_portfolio_pie(weights, "Human Advisor Portfolio")
-    with col2:
-        st.subheader("📈 Portfolio Growth Projection")
-        expected_return = np.dot(weights.values, np.mean(returns, axis=0)) * 252
-        plot_growth(100000, expected_return, 30, key_growth="human")
-
-    st.markdown(
-    """
-    <div style='text-align: center; font-size: 14px; color: grey; margin-top: 50px;'>
-        <strong>Dr. Ahmad Danial bin Zainudin </strong><br>
-        School of Accounting & Finance | Asia Pacific University of Technology & Innovation (Malaysia) <br>
-        danial.zainudin@apu.edu.my
-    </div>
-    """, unsafe_allow_html=True
-    )
-
-# === ROBO ADVISOR TAB ===
-with tabs[6]:
-    st.subheader("🤖 Robo Advisor (Algo does the hard work)")
-
-    age_robo = st.number_input("Enter your age:", min_value=18, max_value=100, value=30, key="age_robo")
-    years_robo = st.number_input("Investment Horizon (years):", min_value=1, max_value=50, value=20, key="years_robo")
-    allocation_method = st.selectbox("Select Allocation Method:", ["Basic (Human)", "Advanced (Algo)"], key="method_robo")
-
-    if allocation_method == "Basic (Human)":
-        weights = basic_allocation("Medium")
-    else:
-        weights = hrp_allocation(returns)
-
-    col1, col2 = st.columns([1, 1])
-    with col1:
-        st.markdown("### Robo Advisor Portfolio")
-        plot_portfolio_pie(weights, "Robo Advisor Portfolio")
-    with col2:
-        st.subheader("📈 Portfolio Growth Projection")
-        expected_return = np.dot(weights.values, np.mean(returns, axis=0)) * 252
-        plot_growth(10000, expected_return, years_robo, key_growth="robo")
-
-    st.markdown(
-    """
-    <div style='text-align: center; font-size: 14px; color: grey; margin-top: 50px;'>
-        <strong>Dr. Ahmad Danial bin Zainudin </strong><br>
-        School of Accounting & Finance | Asia Pacific University of Technology & Innovation (Malaysia) <br>
-        danial.zainudin@apu.edu.my
-    </div>
-    """, unsafe_allow_html=True
-    )
-
-# === BIONIC ADVISOR TAB ===
-with tabs[7]:
-    st.subheader("🦾 Bionic Advisor (Human + Algo works together)")
-    age_bionic = st.number_input("Enter your age:", min_value=5, max_value=100, value=30, key="age_bionic")
-    years_bionic = st.number_input("Investment Horizon (years):", min_value=1, max_value=60, value=20, key="years_bionic")
-
-    # Dynamic Strategy Selection
-    if age_bionic <= 20:
-        strategy = "Aggressive Growth Strategy 🚀"
-        strategy_desc = "Focuses on maximum capital appreciation with high-risk, high-return assets."
-    elif age_bionic <= 35:
-        strategy = "Balanced Growth Strategy ⚖️"
-        strategy_desc = "Balanced approach between capital growth and capital preservation."
-    elif age_bionic <= 50:
-        strategy = "Moderate Growth Strategy 🌿"
-        strategy_desc = "Emphasizes steady growth with moderate risk exposure."
-    else:
-        strategy = "Conservative Growth Strategy 🛡️"
-        strategy_desc = "Protects capital with cautious growth, prioritizing lower volatility assets."
-
-    st.info(f"🔵 Based on your inputs, we suggest a **{strategy}**")
-
-    st.markdown(f"💬 *{strategy_desc}*")
-
-    # Portfolio generation
-    bionic_weights_raw = smart_bionic_strategy(age_bionic, years_bionic)
-    bionic_weights = np.array(bionic_weights_raw) / sum(bionic_weights_raw)
-    weights = pd.Series(bionic_weights, index=stocks)
-
-    col1, col2 = st.columns([1, 1])
-    with col1:
-        st.markdown("### Bionic Advisor Portfolio")
-        plot_portfolio_pie(weights, "Bionic Advisor Portfolio")
-    with col2:
-        st.subheader("📈 Portfolio Growth Projection")
-        expected_return = np.dot(weights.values, np.mean(returns, axis=0)) * 252
-        plot_growth(10000, expected_return, years_bionic, key_growth="bionic")
-
-
-# === CONCLUSION TAB ===
-with tabs[8]:
-    st.header("🎯 Conclusion and Key Takeaways")
-
-    st.markdown("""
----
-## 📚 What Have We Learned?
-
-- Robo-Advisors **democratize investing** — accessible for everyone.
-- A well-crafted **Investment Policy Statement (IPS)** is the foundation.
-- Smart technologies like **MVO**, **GRG**, **HRP** drive intelligent portfolios.
-- Continuous **automatic monitoring** ensures you're always aligned.
-
----
-## 💡 Why This Matters?
-
-- ⏳ **Time-saving**: Less stress, more life.
-- 🧠 **Emotion-free investing**: Say goodbye to fear and greed cycles.
-- 🌍 **Accessible wealth management** for global citizens.
-
----
-## 🚀 Final Thought
-
-> "**The future of wealth management is where human dreams meet machine precision.**"
-
-Let's work smarter, not harder! 💼🤖📈
-""")
-
-    st.markdown(
-    """
-    <div style='text-align: center; font-size: 14px; color: grey; margin-top: 50px;'>
-        <strong>Dr. Ahmad Danial bin Zainudin </strong><br>
-        School of Accounting & Finance | Asia Pacific University of Technology & Innovation (Malaysia) <br>
-        danial.zainudin@apu.edu.my
-    </div>
-    """, unsafe_allow_html=True
-    )
-
-# === GROUP ACTIVITIES TAB ===
-with tabs[9]:
-    st.header("🤝 Group Activities: Build Your Own IPS")
-
-    st.markdown("""
----
-## 📋 Task: Build Your Group's Investment Policy Statement (IPS)
-
-Work together in your group to discuss and document:
-
-- 👥 **Group Profile:**
-  - Average age of members
-  - Investment experience level (Beginner, Intermediate, Advanced)
-
-- 🎯 **Financial Goals:**
-  - Example: Retirement savings, house purchase, children's education
-  - Target wealth amount (e.g., \$500,000 or \$1 million)
-
-- 📅 **Investment Horizon:**
-  - Number of years to achieve your financial goals
-
-- 💧 **Liquidity Needs:**
-  - Any expected large expenses soon? (e.g., tuition fees, house deposit)
-
-- 🔥 **Risk Tolerance:**
-  - Level of risk your group can accept: Low, Moderate, or High
-
----
-✅ Once you complete your IPS, let us test it by playing with the Human Advisor, Robo Advisor, and Bionic Advisor simulations!
-
----
-""")
-
-    st.success("✅ Tip: There is **no one-size-fits-all portfolio** — your IPS reflects **your group’s real goals and attitude toward risk**!")
-
-    st.markdown(
-        """
-        <div style='text-align: center; font-size: 14px; color: grey; margin-top: 50px;'>
-            <strong>Dr. Ahmad Danial bin Zainudin </strong><br>
-            School of Accounting & Finance | Asia Pacific University of Technology & Innovation (Malaysia) <br>
-            danial.zainudin@apu.edu.my
-        </div>
-        """, unsafe_allow_html=True
-    )
+# === Streamlit Robo-Advisor Full Site with Proper Tabs ===
+import os
+import tempfile
+import uuid
+import streamlit as st
+import assets
+import charts
+import rba
+
+# ============ PAGE SETTING ============
+st.set_page_config(page_title="Robo-Advisor with Dr. Danial!", layout="wide")
+st.title("🔮 Experience Robo-Advisor with Dr. Danial!")
+
+# ============ PROFILING ============
+# Every rerun is traced with timing spans (see rba.profiling) and, with
+# RBA_PROFILE_LOG set, logged as JSON lines. RBA_ADMIN=1 adds a sidebar
+# panel with this rerun's spans and percentiles across sessions.
+session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex[:12])
+trace = rba.start_trace(session_id)
+# Server-side only: the panel shows every session's timings, so no query
+# parameter a visitor could add turns it on
+ADMIN = os.environ.get("RBA_ADMIN") == "1"
+
+# ============ DATA PREPARATION ============
+# Daily return history can live on local disk as a columnar, memory-mapped
+# panel (see rba.ReturnsStore); without one the app falls back to a synthetic year.
+# It is loaded once per process, by the first page that needs it.
+RETURNS_STORE = os.environ.get("RBA_RETURNS_STORE")
+LOOKBACK_DAYS = os.environ.get("RBA_LOOKBACK_DAYS")
+
+@st.cache_resource(show_spinner=False)
+def market_data(store_path, lookback_days):
+    return rba.load_returns(store_path, int(lookback_days or rba.LOOKBACK_DAYS))
+
+# ============ CACHING ============
+# Allocation results live in Streamlit's process-wide data cache, so every
+# session shares them; entries are keyed by a fingerprint of the returns
+# buffer plus the call parameters and evicted least-recently-used.
+CACHE_MAX_ENTRIES = 256
+
+# Types are named rather than imported so the markdown pages never load numpy
+RETURNS_HASH_FUNCS = {
+    "numpy.ndarray": lambda array: rba.returns_fingerprint(array),
+    "numpy.memmap": lambda array: rba.returns_fingerprint(array),
+}
+
+cache_allocation = st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False, hash_funcs=RETURNS_HASH_FUNCS)
+
+def cached(name, cache=cache_allocation, source=rba):
+    # Looked up in `source` on the first call, so a page that never calls it
+    # never imports its module. The span covers hashing the arguments and the
+    # lookup; a miss nests the function's own span inside it.
+    wrapped = None
+    def call(*args, **kwargs):
+        nonlocal wrapped
+        if wrapped is None:
+            wrapped = rba.profiled(f"cache:{name}")(cache(getattr(source, name)))
+        return wrapped(*args, **kwargs)
+    call.name = name
+    return call
+
+hrp_backtest = cached("hrp_backtest")
+growth_projection = cached("growth_projection")
+efficient_frontier = cached("efficient_frontier")
+mvo_allocation = cached("mvo_allocation")
+simulate_rebalancing = cached("simulate_rebalancing")
+risk_metrics = cached("risk_metrics")
+scenario_library = cached("scenario_library")
+stress_test = cached("stress_test")
+
+# The Human, Robo (Basic/HRP) and Bionic advisors read weights, expected
+# returns and projections from a table precomputed once per returns window
+# (see rba.lookup) and kept on disk, so an interaction is an array lookup.
+allocation_table = cached("load_allocation_table", st.cache_resource(
+    show_spinner="Precomputing allocation table...", hash_funcs=RETURNS_HASH_FUNCS))
+
+# ============ CHARTS ============
+# "native" (default) sends Vega-Lite specs the browser draws, built once per
+# set of inputs and kept in the data cache with the allocations; a rerun
+# with unchanged inputs only looks them up. "classic" rebuilds the Plotly pie
+# and renders the growth chart to a matplotlib PNG on every rerun.
+CHART_MODE = os.environ.get("RBA_CHARTS", "native")
+
+portfolio_pie_spec = cached("portfolio_pie_spec", source=charts)
+growth_chart_spec = cached("growth_chart_spec", source=charts)
+
+# ============ STATIC CONTENT ============
+# The informational pages are fixed text: adjacent blocks go out as one
+# precompiled markdown fragment (see assets.fragment) rather than an element
+# each, and the portrait is resized and encoded once per process. "webp"
+# (default) sends it inline as a WebP data URL, so the server does no image
+# work per view; "jpeg" sends the pre-resized JPEG through Streamlit's media
+# store, which costs a header parse per view but lets the browser fetch it
+# by URL.
+IMAGE_MODE = os.environ.get("RBA_IMAGES", "webp")
+
+SIGNATURE = """
+<div style='text-align: center; font-size: {font_size}px; color: {color}; margin-top: {margin_top}px;'>
+    <strong>Dr. Ahmad Danial bin Zainudin</strong><br>
+    School of Accounting & Finance | Asia Pacific University of Technology & Innovation (Malaysia)<br>
+    danial.zainudin@apu.edu.my
+</div>
+"""
+
+def signature(font_size=14, color="grey", margin_top=50):
+    return SIGNATURE.format(font_size=font_size, color=color, margin_top=margin_top)
+
+def static_markdown(*blocks):
+    st.markdown(assets.fragment(*blocks), unsafe_allow_html=True)
+
+# ============ BACKGROUND JOBS ============
+# "background" (default) runs the slow Robo computations on rba's shared job
+# pool instead of in the rerun: until a job lands the page keeps showing the
+# last result this session saw, under a progress bar that reruns the page
+# when the job finishes. Sessions asking for the same inputs share one job.
+# "blocking" computes them inline through the caches above.
+COMPUTE_MODE = os.environ.get("RBA_COMPUTE", "background")
+JOB_POLL_SECONDS = 0.5
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def job_progress(job, label):
+    if job.done():
+        st.rerun()
+    progress = rba.job_queue().progress(job)
+    st.progress(progress or 0.0, text=f"{label}... {job.elapsed():.0f}s")
+
+def background(function, label, *args, **kwargs):
+    # (result, current): the result for these inputs, or while their job
+    # runs the last one this session saw (None before the first) and False
+    if COMPUTE_MODE == "blocking":
+        return function(*args, **kwargs), True
+    job = rba.job_queue().submit(rba.job_key(function.name, *args, **kwargs), getattr(rba, function.name),
+                                 *args, **kwargs)
+    if job.done():
+        st.session_state[f"job_{function.name}"] = job.result()
+        return job.result(), True
+    job_progress(job, label)
+    return st.session_state.get(f"job_{function.name}"), False
+
+def advisor_table(returns):
+    # A table already on disk loads in milliseconds through the cache above;
+    # building one (HRP for every linkage method and a projection per
+    # portfolio, seconds) runs on the job pool, with the advisor page waiting
+    # under its progress bar (None until then)
+    if not os.path.exists(rba.allocation_table_path(returns)):
+        _, current = background(allocation_table, "Precomputing allocation table", returns)
+        if not current:
+            return None
+    return allocation_table(returns)
+
+# ============ START-UP ============
+# "lazy" (default) defers scipy, matplotlib, plotly and the return data to
+# the first advisor page (the native charts never load the last two); "eager"
+# loads them all on the first run instead.
+STARTUP_MODE = os.environ.get("RBA_STARTUP", "lazy")
+
+if STARTUP_MODE == "eager":
+    rba.preload()
+    charts.preload()
+    assets.preload()
+    allocation_table(market_data(RETURNS_STORE, LOOKBACK_DAYS)[2])
+
+# With RBA_RESULT_CACHE set, HRP, covariance and projection results survive
+# restarts on disk; the entries used most are read back once per process.
+# Checked here so that without it a first paint never imports the cache.
+RESULT_CACHE_PATH = os.environ.get("RBA_RESULT_CACHE")
+
+@st.cache_resource(show_spinner=False)
+def warm_result_cache():
+    return rba.result_cache(RESULT_CACHE_PATH).preload()
+
+if RESULT_CACHE_PATH:
+    warm_result_cache()
+
+# ============ FUNCTIONS ============
+
+def plot_portfolio_pie(weights, title):
+    if CHART_MODE == "native":
+        spec = portfolio_pie_spec(weights, title)
+        with rba.span("st.vega_lite_chart"):
+            st.vega_lite_chart(spec, width="content")
+        return
+    figure = charts.portfolio_pie_figure(weights, title)
+    with rba.span("st.plotly_chart"):
+        st.plotly_chart(figure, width="content")
+
+def plot_growth(initial_investment, expected_return, years, key_growth, bands=None):
+    if CHART_MODE == "native":
+        spec = growth_chart_spec(initial_investment, expected_return, years, bands)
+        with rba.span("st.vega_lite_chart"):
+            st.vega_lite_chart(spec, width="stretch", key=f"growth_{key_growth}")
+        return
+    figure = charts.growth_figure(initial_investment, expected_return, years, bands)
+    with rba.span("st.pyplot"):
+        st.pyplot(figure, clear_figure=True)
+
+def show_goal_probability(goal_probability, goal):
+    st.metric(f"Chance of reaching ${goal:,.0f}", f"{goal_probability.iloc[-1]:.0%}")
+
+COMPARISON_LABELS = ["This portfolio", "Human", "Robo (HRP)", "Bionic"]
+
+def comparison_portfolios(weights, table, age):
+    # This tab's portfolio next to the Human (Medium), Robo (HRP) and Bionic
+    # portfolios for the same age, measured together in one batch
+    rows = [table.row("basic"), table.row("hrp"), table.row("bionic", age=age)]
+    return [weights.values] + [table.weights[row] for row in rows]
+
+def show_risk_metrics(weights, returns, table, age, key):
+    with st.expander("🛡️ Risk metrics"):
+        horizon = st.radio("Loss horizon:", ["1 day", "1 month"], horizontal=True, key=f"horizon_{key}")
+        report = risk_metrics(comparison_portfolios(weights, table, age), returns,
+                              horizon_days=1 if horizon == "1 day" else 21, universe=weights.index.tolist())
+        summary = report.summary.set_axis(COMPARISON_LABELS)
+        this = summary.iloc[0]
+        col_a, col_b, col_c, col_d = st.columns(4)
+        col_a.metric("Volatility per year", f"{this['Volatility']:.1%}")
+        col_b.metric(f"95% VaR ({horizon})", f"{this['VaR']:.2%}")
+        col_c.metric(f"95% CVaR ({horizon})", f"{this['CVaR']:.2%}")
+        col_d.metric("Max drawdown", f"{this['Max Drawdown']:.1%}")
+        st.dataframe(summary, column_config={column: st.column_config.NumberColumn(format="percent")
+                                             for column in summary.columns})
+        st.markdown("**Share of portfolio variance by stock**")
+        st.bar_chart(report.risk_contributions.iloc[0])
+
+def show_stress_test(weights, history, dates, table, age, key):
+    with st.expander("🌪️ Stress scenarios"):
+        scenarios = scenario_library(history, dates, rba.TICKERS)
+        result = stress_test(comparison_portfolios(weights, table, age), scenarios.shocks, scenarios.names, record=True)
+        pnl = result.pnl.set_axis(COMPARISON_LABELS, axis=1)
+        rolling = pnl["This portfolio"][[kind == "rolling" for kind in scenarios.kinds]]
+        window = rba.stress.ROLLING_WINDOW_DAYS
+        worst = result.portfolios.iloc[0]
+        col_a, col_b, col_c = st.columns(3)
+        col_a.metric("Worst scenario loss", f"{worst['Worst Loss']:.1%}", worst["Worst Scenario"],
+                     delta_color="off", delta_arrow="off")
+        col_b.metric(f"Worst {window}-day loss in the history", f"{max(-rolling.min(), 0):.1%}")
+        col_c.metric(f"5% of {window}-day windows lose more than", f"{max(-rolling.quantile(0.05), 0):.1%}")
+        st.markdown("**Return in each scenario**")
+        st.bar_chart(pnl[[kind != "rolling" for kind in scenarios.kinds]], stack=False)
+        st.caption("Hypothetical shocks are calibrated on past episodes; historical episodes appear "
+                   "when the loaded price history covers them.")
+
+# ============ PAGES ============
+
+# === ABOUT ME TAB ===
+def about_me_page():
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        with rba.span("st.image"):
+            portrait = assets.image_asset(assets.PORTRAIT, assets.PORTRAIT_WIDTH)
+            st.image(portrait.webp_uri if IMAGE_MODE == "webp" else portrait.jpeg, width=assets.PORTRAIT_WIDTH)
+    with col2:
+        st.subheader("👤 About Dr. Ahmad Danial Zainudin, PhD, CFTe")
+        static_markdown("""
+*Finance academician with strong integration of industry experience and scholarly engagement.*
+
+👨🏻‍💼 **Professional Experience**  
+- Held various derivatives trading positions in Phillip Futures, Maybank Investment Bank, and CIMB Investment Bank.  
+- Certified Financial Technician (CFTe) with experience in **investment**, **markets**, and **hedging strategies**.
+
+🏛️ **Academic Leadership and Teaching Focus**  
+- Senior Lecturer and Programme Leader for **Master in Finance** at **Asia Pacific University**.  
+- Teaching fixed income and equity investment, financial management, international banking and investment, robo-advisor, and FinTech using Python.
+
+🔬 **Research Interests**  
+- Computational Finance  
+- Automated Asset Allocations and Hedging Strategies  
+- Econophysics and Market Microstructure
+
+🏆 **Recognitions**  
+- Top Futures Broker (Bursa Malaysia)  
+- Maybank Staff Academic Award  
+- IVIC Bronze Medal.
+""")
+
+    # Centered Signature
+    static_markdown(signature())
+
+# === WHAT IS ROBO ADVISOR ===
+def what_is_robo_advisor_page():
+    static_markdown("<h2 style='font-size:26px; color:black;'>📚 What is a Robo-Advisor?</h2>", "---")
+
+    with st.expander("1. 📖 Introduction to Robo-Advisors"):
+        static_markdown("""
+<div style='font-size:16px; color:black;'>
+- <b>Robo-Advisors</b> = <i>Automation + Investment Intelligence</i>.<br>
+- Digital platforms offering <b>automated, algorithm-driven</b> financial planning and investing services.<br>
+- Require <b>minimal human supervision</b> compared to traditional advisors.<br>
+- Aim to make <b>professional-grade investment management</b> affordable and accessible to <b>everyone</b>, not just the wealthy.<br><br>
+
+🔵 <b>In short:</b><br>
+<b>Robo-Advisors = Your smart financial manager, available 24/7, without emotional bias.</b>
+</div>
+""")
+
+    with st.expander("2. 🏛️ What is Digital Investment Management (DIM)?"):
+        static_markdown("""
+<div style='font-size:16px; color:black;'>
+- <b>DIM</b> is the technological backbone powering Robo-Advisors.<br>
+- It automates the entire investment journey:<br>
+    - Client onboarding and profiling<br>
+    - Risk appetite analysis<br>
+    - Portfolio construction and asset allocation<br>
+    - Continuous monitoring and automatic rebalancing<br>
+    - Transparent reporting and updates<br><br>
+
+✅ <b>DIM replaces manual wealth management with data, algorithms, and AI-driven intelligence.</b>
+</div>
+""")
+
+    with st.expander("3. 🔄 How Do Robo-Advisors Work? (Simple Workflow)"):
+        static_markdown("""
+<div style='font-size:16px; color:black;'>
+1. <b>You answer a simple questionnaire</b> (age, goals, risk comfort, investment timeline).<br>
+2. <b>Algorithm constructs a diversified portfolio</b> tailored to your profile.<br>
+3. <b>Ongoing monitoring and auto-rebalancing</b> to maintain optimal allocation.<br>
+4. <b>Transparent, real-time reporting</b> keeps you updated on performance and risks.<br><br>
+
+✅ <b>No guessing. No emotions. Just disciplined, data-driven investing!</b>
+</div>
+""")
+
+    with st.expander("4. 🎯 Benefits of Robo-Advisors"):
+        static_markdown("""
+<div style='font-size:16px; color:black;'>
+- <b>Low Costs:</b>  
+  Robo-Advisors charge significantly lower management fees compared to traditional human advisors.<br>
+- <b>Accessibility:</b>  
+  Start investing with as little as <b>$100 or less</b>.<br>
+- <b>Automatic Diversification:</b>  
+  Investments spread across different asset classes to minimize risk.<br>
+- <b>Emotion-Free Investing:</b>  
+  Algorithms make decisions logically, free from panic or greed.<br>
+- <b>Continuous Optimization:</b>  
+  Portfolios auto-adjust to reflect changing market conditions.<br>
+- <b>Transparent Fees and Reporting:</b>  
+  Easy-to-understand breakdowns of costs and portfolio performance.<br><br>
+
+✅ <b>Professional wealth management, accessible without needing to be a financial expert!</b>
+</div>
+""")
+
+    with st.expander("5. ⚖️ Limitations"):
+        static_markdown("""
+<div style='font-size:16px; color:black;'>
+- <b>Limited Personalization:</b>  
+  Algorithms may struggle with highly complex or specialized financial needs.<br>
+- <b>Model Risk:</b>  
+  Over-reliance on historical assumptions may underperform during market shocks.<br>
+- <b>Regulatory Evolution:</b>  
+  Regulations for digital investment services are still evolving in many countries.<br><br>
+
+🎯 <b>Bottom Line:</b><br>
+<b>Robo-Advisors are ideal for most investors, but for complex cases, human advisors may still add value.</b>
+</div>
+""")
+
+    st.success("✅ **Robo-Advisors represent the future: affordable, intelligent, and emotion-free wealth management for all investors! 🚀**")
+
+    # Centered Signature
+    static_markdown("---", signature(13, margin_top=30))
+
+# === THE ROOTS OF ROBO ADVISOR ===
+def roots_of_robo_advisor_page():
+    static_markdown(
+        "<h2 style='font-size:26px; color:black;'>📜 Evolution of Robo-Advisory: From Theory to Automation</h2>",
+        "<h3 style='font-size:20px; color:black;'>🧠 Birth of Investment Science (1952)</h3>",
+        """
+- **Harry Markowitz** introduced **Modern Portfolio Theory (MPT)**.
+- Shifted investing from stock-picking to **portfolio optimization**.
+- Introduced the concept of the **risk-return frontier** and **diversification principles**.
+""",
+        "<h3 style='font-size:20px; color:black;'>💻 Rise of Financial Computing (1970s–1990s)</h3>",
+        """
+- Rise of **financial simulations**, **MVO (Mean-Variance Optimization)**, and **algorithmic trading**.
+- Increased use of **mathematical modeling** in portfolio management.
+""",
+        "<h3 style='font-size:20px; color:black;'>🌍 Trust Crisis (Post-2008)</h3>",
+        """
+- Following the **Global Financial Crisis (2008)**, investor trust declined.
+- Demands for **transparency**, **low costs**, and **emotion-free investing** surged.
+- Paved the way for the emergence of **Robo-Advisory platforms**.
+""",
+        "<h3 style='font-size:20px; color:black;'>🚀 Maturity and Rise of Robo-Advisory (2008 Onwards)</h3>",
+        """
+- **Betterment** and **Wealthfront** emerged as pioneers of **digital wealth advisory**, making automated investing accessible to everyday investors.
+- Embedded sophisticated financial models into user-friendly platforms:
+  - **Modern Portfolio Theory (MPT):** Optimize returns relative to risk.
+  - **Black-Litterman Model:** Blend market consensus with personalized views.
+  - **Hierarchical Risk Parity (HRP):** Balance portfolio risks without relying on unstable correlations.
+- The marriage of **automation** and **algorithmic intelligence** redefined wealth management.
+- Democratized access to professional-grade investment strategies once reserved for the ultra-wealthy.
+""",
+    )
+
+    st.success("✅ Robo-Advisory is the natural evolution of decades of financial innovation.")
+
+    static_markdown(signature(13))
+
+# === HOW IT WORKS ===
+def how_it_works_page():
+    static_markdown(
+        "<h2 style='text-align:left; font-size:28px; color:black;'>How Does a Robo-Advisor Work?</h2>",
+        "<h3 style='font-size:22px; color:black;'>Step 1: Creating Your Investment Policy Statement (IPS)</h3>",
+        """
+<div style='font-size:16px; color:black;'>
+<ul>
+<li><b>Age</b> and <b>Investment Horizon</b></li>
+<li><b>Risk Tolerance</b> (Low, Medium, High)</li>
+<li><b>Financial Goals</b> (e.g., Retirement, Home Purchase, Education)</li>
+<li><b>Liquidity Needs</b> and <b>Time Preferences</b></li>
+</ul>
+
+<p style='font-size:14px;'>👉 The IPS acts as your personal investment blueprint — guiding portfolio construction and future rebalancing!</p>
+</div>
+""",
+        "---",
+        "<h3 style='font-size:22px; color:black;'>Step 2: Designing the Ideal Portfolio (ICM Mix)</h3>",
+        """
+<div style='font-size:16px; color:black;'>
+<b>Based on your IPS, Robo-Advisors build a diversified portfolio using:</b>
+<ul>
+<li><b>Stocks</b> — for growth potential</li>
+<li><b>Bonds</b> — for stability and income</li>
+<li><b>Cash</b> — for liquidity</li>
+<li><b>Alternatives</b> (e.g., Real Estate, Commodities)</li>
+</ul>
+
+⚡ <b>Objective:</b> Find the right balance between maximizing returns and minimizing risks.
+</div>
+""",
+        "---",
+        "<h3 style='font-size:22px; color:black;'>Step 3: Intelligent Optimization Models</h3>",
+        """
+<div style='font-size:16px; color:black;'>
+
+<b>Mean-Variance Optimization (MVO)</b><br>
+- Seeks the best risk-return combination by balancing expected returns and portfolio volatility.<br><br>
+
+<b>Generalized Reduced Gradient (GRG)</b><br>
+- Solves optimization problems when portfolios have multiple real-world constraints (like minimum or maximum weightings).<br><br>
+
+<b>Hierarchical Risk Parity (HRP)</b><br>
+- Clusters similar assets and allocates risks intelligently across them.<br>
+- Especially powerful during volatile markets when asset correlations become unstable.
+
+</div>
+""",
+        "---",
+        "<h3 style='font-size:22px; color:black;'>Step 4: Continuous Monitoring & Rebalancing</h3>",
+        """
+<div style='font-size:16px; color:black;'>
+<ul>
+<li><b>Market fluctuations</b> can cause your portfolio to drift from its target allocation.</li>
+<li><b>Automatic rebalancing</b> ensures your portfolio stays aligned with your risk profile.</li>
+<li><b>Emotion-free investing:</b> Avoid panic selling or greedy overexposure.</li>
+</ul>
+
+✅ Investing made smarter, simpler, and truly dynamic.
+</div>
+""",
+        "---",
+        # Centered Signature
+        signature(13, color="white", margin_top=30),
+    )
+
+# === WHO USES ROBO ADVISOR ===
+def who_uses_robo_advisor_page():
+    static_markdown("<h2 style='font-size:26px; color:black;'>👥 Who Uses Robo-Advisors?</h2>", """
+<div style='font-size:16px; color:black;'>
+
+- 👨‍🎓 <b>Young Professionals:</b><br>
+  Just starting their careers, aiming to build wealth systematically at low cost.<br><br>
+
+- 👩‍💼 <b>Busy Executives:</b><br>
+  Prefer automated, hands-off investment management while focusing on their demanding careers.<br><br>
+
+- 👵 <b>Retirees:</b><br>
+  Seeking stable income streams and conservative risk-managed portfolios.<br><br>
+
+- 🏢 <b>Small Businesses and SMEs:</b><br>
+  Managing idle cash reserves through low-cost, diversified portfolios.<br><br>
+
+- 🌍 <b>Global Citizens:</b><br>
+  Investors seeking easy cross-border access to diversified international markets.<br><br>
+
+- 🏦 <b>Institutional Players (Pensions, Endowments, Foundations):</b><br>
+  Utilizing robo-platforms for niche mandates (e.g., cash management, ESG portfolios, or tactical allocations) to complement traditional strategies.<br><br>
+
+✅ <b>Common Theme:</b><br>
+👉 Desire for simplicity, lower fees, transparency, and emotion-free investment discipline.
+
+</div>
+""", "---")
+
+    st.success("✅ Robo-Advisory adoption is accelerating across individuals, businesses, and even institutional segments!")
+
+    static_markdown(signature(13, margin_top=30))
+
+# === HUMAN ADVISOR TAB ===
+def human_advisor_page():
+    st.subheader("👤 Human Advisor (100% human decision)")
+
+    age_human = st.number_input("Enter your age:", min_value=18, max_value=100, value=30, key="age_human")
+    risk = st.selectbox("Select your risk tolerance:", ["Low", "Medium", "High"], key="risk_human")
+
+    goal_human = st.number_input("Target wealth ($):", min_value=1000, value=300000, step=10000, key="goal_human")
+
+    history, history_dates, returns = market_data(RETURNS_STORE, LOOKBACK_DAYS)
+    table = advisor_table(returns)
+    if table is None:
+        return
+    row = table.row("basic", risk=risk)
+    weights = table.allocation(row)
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.markdown("### Human Advisor Portfolio")
+        plot_portfolio_pie(weights, "Human Advisor Portfolio")
+    with col2:
+        st.subheader("📈 Portfolio Growth Projection")
+        expected_return = table.expected_return[row]
+        bands, goal_probability = table.projection(row, 100000, 30, goal_human)
+        plot_growth(100000, expected_return, 30, key_growth="human", bands=bands)
+        show_goal_probability(goal_probability, goal_human)
+
+    show_risk_metrics(weights, returns, table, age_human, key="human")
+    show_stress_test(weights, history, history_dates, table, age_human, key="human")
+
+    static_markdown(signature())
+
+# === ROBO ADVISOR TAB ===
+def robo_advisor_page():
+    st.subheader("🤖 Robo Advisor (Algo does the hard work)")
+
+    age_robo = st.number_input("Enter your age:", min_value=18, max_value=100, value=30, key="age_robo")
+    years_robo = st.number_input("Investment Horizon (years):", min_value=1, max_value=50, value=20, key="years_robo")
+    goal_robo = st.number_input("Target wealth ($):", min_value=1000, value=30000, step=1000, key="goal_robo")
+    allocation_method = st.selectbox("Select Allocation Method:", ["Basic (Human)", "Advanced (Algo)", "Advanced (MVO)"], key="method_robo")
+
+    history, history_dates, returns = market_data(RETURNS_STORE, LOOKBACK_DAYS)
+    table = advisor_table(returns)
+    if table is None:
+        return
+    row = None
+    if allocation_method == "Basic (Human)":
+        row = table.row("basic", risk="Medium")
+    elif allocation_method == "Advanced (Algo)":
+        linkage_method = st.selectbox("Linkage Method:", rba.LINKAGE_METHODS, key="linkage_robo")
+        row = table.row("hrp", method=linkage_method)
+    else:
+        max_weight = st.slider("Maximum weight per stock (%):", min_value=10, max_value=100, value=40, step=5, key="max_weight_robo") / 100
+        target_volatility = st.slider("Target volatility (% per year):", min_value=2.0, max_value=40.0, value=15.0, step=0.5, key="volatility_robo") / 100
+        frontier, current = background(efficient_frontier, "Tracing the efficient frontier", returns, max_weight=max_weight)
+        if current:
+            weights = mvo_allocation(returns, target_volatility, max_weight=max_weight, frontier=frontier)
+            st.session_state["weights_mvo"] = weights
+        else:
+            # The last portfolio goes with the last frontier's bounds
+            weights = st.session_state.get("weights_mvo")
+        if weights is None:
+            return
+        with st.expander("📐 Efficient frontier"):
+            st.caption(f"Attainable volatility: {frontier.volatility.min():.1%} to {frontier.volatility.max():.1%} per year. "
+                       "Targets outside that range get the nearest end of the frontier.")
+            st.scatter_chart(frontier.volatility.to_frame().join(frontier.expected_return), x="Volatility", y="Expected Return")
+    if row is not None:
+        weights = table.allocation(row)
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.markdown("### Robo Advisor Portfolio")
+        plot_portfolio_pie(weights, "Robo Advisor Portfolio")
+    with col2:
+        st.subheader("📈 Portfolio Growth Projection")
+        if row is not None:
+            expected_return = table.expected_return[row]
+            bands, goal_probability = table.projection(row, 10000, years_robo, goal_robo)
+        else:
+            expected_return = rba.expected_return(weights.values, returns)
+            bands, goal_probability = growth_projection(weights.values, returns, 10000, years_robo, goal_robo)
+        plot_growth(10000, expected_return, years_robo, key_growth="robo", bands=bands)
+        show_goal_probability(goal_probability, goal_robo)
+
+    show_risk_metrics(weights, returns, table, age_robo, key="robo")
+    show_stress_test(weights, history, history_dates, table, age_robo, key="robo")
+
+    if allocation_method == "Advanced (Algo)":
+        with st.expander("🔁 Backtest: HRP with monthly rebalancing"):
+            lookback = st.slider("Lookback window (days):", min_value=21, max_value=len(history) - 21,
+                                 value=min(252, len(history) // 2), step=21, key="lookback_robo")
+            window_type = st.radio("Window:", ["Rolling", "Expanding"], horizontal=True, key="window_robo")
+            backtest, _ = background(hrp_backtest, "Running the backtest", history, lookback, 21,
+                                     window_type == "Expanding", linkage_method, dates=history_dates)
+            if backtest is not None:
+                st.metric("Average turnover per rebalance", f"{backtest.turnover.iloc[1:].mean():.1%}")
+                st.markdown("**Growth of $1**")
+                st.line_chart((1 + backtest.portfolio_returns).cumprod())
+                st.markdown("**Weights at each rebalance**")
+                st.area_chart(backtest.weights)
+
+    with st.expander("⚖️ Drift and rebalancing"):
+        rule = st.radio("Rebalancing rule:", ["Tolerance band", "Calendar"], horizontal=True, key="rule_robo")
+        if rule == "Tolerance band":
+            band = st.slider("Rebalance when any weight drifts by more than (%):", min_value=1, max_value=20, value=5, key="band_robo") / 100
+            rule_args = {"rule": "band", "band": band}
+        else:
+            period = st.selectbox("Rebalance every:", ["Month", "Quarter", "Year"], key="period_robo")
+            rule_args = {"rule": "calendar", "period": {"Month": 21, "Quarter": 63, "Year": 252}[period]}
+        cost_bps = st.number_input("Transaction cost (bps):", min_value=0, max_value=200, value=10, key="cost_robo")
+        simulation = simulate_rebalancing(weights.values, history, cost_bps=cost_bps, dates=history_dates, record=True, **rule_args)
+        hold = simulate_rebalancing(weights.values, history, rule="none", dates=history_dates, record=True)
+        summary = simulation.summary.iloc[0]
+        col_a, col_b, col_c, col_d = st.columns(4)
+        col_a.metric("Rebalances", f"{summary['Rebalances']:,.0f}")
+        col_b.metric("Turnover per year", f"{summary['Turnover']:.1%}")
+        col_c.metric("Tracking error", f"{summary['Tracking Error']:.2%}",
+                     f"{summary['Tracking Error'] - hold.summary['Tracking Error'].iloc[0]:+.2%} vs buy and hold", delta_color="inverse")
+        col_d.metric("Cost drag per year", f"{summary['Cost Drag']:.3%}")
+        st.markdown("**Growth of $1**")
+        st.line_chart(simulation.values.set_axis([rule], axis=1).join(hold.values.set_axis(["Buy and hold"], axis=1)))
+
+    with st.expander("📂 Bulk client onboarding"):
+        st.markdown("Upload a CSV or Parquet file with **age**, **horizon** and **risk** columns, "
+                    "and optionally **strategy** (basic, bionic or hrp).")
+        upload = st.file_uploader("Client profiles:", type=["csv", "parquet"], key="profiles_robo")
+        if upload is not None:
+            # Allocated on request only, and kept for this upload and returns
+            # window, so other widgets on the page rerun without redoing it
+            suffix = os.path.splitext(upload.name)[1]
+            upload_key = (upload.file_id, rba.returns_fingerprint(returns))
+            allocated = st.session_state.get("bulk_robo")
+            if allocated is not None and allocated[0] != upload_key:
+                allocated = None
+            if allocated is None and st.button("Allocate profiles", key="allocate_robo"):
+                with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as output:
+                    output_path = output.name
+                try:
+                    rows = rba.batch_allocate_file(upload, output_path, returns)
+                    with open(output_path, "rb") as f:
+                        allocated = (upload_key, rows, f.read())
+                    st.session_state["bulk_robo"] = allocated
+                except ValueError as e:
+                    st.error(f"Could not allocate {upload.name}: {e}")
+                finally:
+                    os.remove(output_path)
+            if allocated is not None:
+                _, rows, data = allocated
+                st.success(f"Allocated {rows:,} client profiles.")
+                st.download_button("Download allocations", data, file_name=f"allocations{suffix}", key="download_robo")
+
+    static_markdown(signature())
+
+# === BIONIC ADVISOR TAB ===
+def bionic_advisor_page():
+    st.subheader("🦾 Bionic Advisor (Human + Algo works together)")
+    age_bionic = st.number_input("Enter your age:", min_value=5, max_value=100, value=30, key="age_bionic")
+    years_bionic = st.number_input("Investment Horizon (years):", min_value=1, max_value=60, value=20, key="years_bionic")
+    goal_bionic = st.number_input("Target wealth ($):", min_value=1000, value=30000, step=1000, key="goal_bionic")
+
+    # Dynamic Strategy Selection
+    if age_bionic <= 20:
+        strategy = "Aggressive Growth Strategy 🚀"
+        strategy_desc = "Focuses on maximum capital appreciation with high-risk, high-return assets."
+    elif age_bionic <= 35:
+        strategy = "Balanced Growth Strategy ⚖️"
+        strategy_desc = "Balanced approach between capital growth and capital preservation."
+    elif age_bionic <= 50:
+        strategy = "Moderate Growth Strategy 🌿"
+        strategy_desc = "Emphasizes steady growth with moderate risk exposure."
+    else:
+        strategy = "Conservative Growth Strategy 🛡️"
+        strategy_desc = "Protects capital with cautious growth, prioritizing lower volatility assets."
+
+    st.info(f"🔵 Based on your inputs, we suggest a **{strategy}**")
+
+    st.markdown(f"💬 *{strategy_desc}*")
+
+    # Portfolio generation
+    history, history_dates, returns = market_data(RETURNS_STORE, LOOKBACK_DAYS)
+    table = advisor_table(returns)
+    if table is None:
+        return
+    row = table.row("bionic", age=age_bionic)
+    weights = table.allocation(row)
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.markdown("### Bionic Advisor Portfolio")
+        plot_portfolio_pie(weights, "Bionic Advisor Portfolio")
+    with col2:
+        st.subheader("📈 Portfolio Growth Projection")
+        expected_return = table.expected_return[row]
+        bands, goal_probability = table.projection(row, 10000, years_bionic, goal_bionic)
+        plot_growth(10000, expected_return, years_bionic, key_growth="bionic", bands=bands)
+        show_goal_probability(goal_probability, goal_bionic)
+
+    show_risk_metrics(weights, returns, table, age_bionic, key="bionic")
+    show_stress_test(weights, history, history_dates, table, age_bionic, key="bionic")
+
+
+# === CONCLUSION TAB ===
+def conclusion_page():
+    st.header("🎯 Conclusion and Key Takeaways")
+
+    static_markdown("""
+---
+## 📚 What Have We Learned?
+
+- Robo-Advisors **democratize investing** — accessible for everyone.
+- A well-crafted **Investment Policy Statement (IPS)** is the foundation.
+- Smart technologies like **MVO**, **GRG**, **HRP** drive intelligent portfolios.
+- Continuous **automatic monitoring** ensures you're always aligned.
+
+---
+## 💡 Why This Matters?
+
+- ⏳ **Time-saving**: Less stress, more life.
+- 🧠 **Emotion-free investing**: Say goodbye to fear and greed cycles.
+- 🌍 **Accessible wealth management** for global citizens.
+
+---
+## 🚀 Final Thought
+
+> "**The future of wealth management is where human dreams meet machine precision.**"
+
+Let's work smarter, not harder! 💼🤖📈
+""", signature())
+
+# === GROUP ACTIVITIES TAB ===
+def group_activities_page():
+    st.header("🤝 Group Activities: Build Your Own IPS")
+
+    static_markdown("""
+---
+## 📋 Task: Build Your Group's Investment Policy Statement (IPS)
+
+Work together in your group to discuss and document:
+
+- 👥 **Group Profile:**
+  - Average age of members
+  - Investment experience level (Beginner, Intermediate, Advanced)
+
+- 🎯 **Financial Goals:**
+  - Example: Retirement savings, house purchase, children's education
+  - Target wealth amount (e.g., \$500,000 or \$1 million)
+
+- 📅 **Investment Horizon:**
+  - Number of years to achieve your financial goals
+
+- 💧 **Liquidity Needs:**
+  - Any expected large expenses soon? (e.g., tuition fees, house deposit)
+
+- 🔥 **Risk Tolerance:**
+  - Level of risk your group can accept: Low, Moderate, or High
+
+---
+✅ Once you complete your IPS, let us test it by playing with the Human Advisor, Robo Advisor, and Bionic Advisor simulations!
+
+---
+""")
+
+    st.success("✅ Tip: There is **no one-size-fits-all portfolio** — your IPS reflects **your group’s real goals and attitude toward risk**!")
+
+    static_markdown(signature())
+
+
+# ============ NAVIGATION ============
+# "lazy" (default) runs only the selected page on each rerun; "tabs" keeps the
+# original single-page layout, which executes every page body each time.
+NAVIGATION_MODE = os.environ.get("RBA_NAVIGATION", "lazy")
+# RBA_START_PAGE=<url path> serves that page at / instead of About Me; set
+# by the server only (the page benchmarks select pages with it)
+START_PAGE = os.environ.get("RBA_START_PAGE", "about-me")
+
+pages = [
+    ("About Me", "about-me", about_me_page),
+    ("What is Robo Advisor?", "what-is-robo-advisor", what_is_robo_advisor_page),
+    ("The Roots of Robo Advisor", "roots-of-robo-advisor", roots_of_robo_advisor_page),
+    ("How it Works?", "how-it-works", how_it_works_page),
+    ("Who Uses Robo Advisor?", "who-uses-robo-advisor", who_uses_robo_advisor_page),
+    ("Human Advisor", "human-advisor", human_advisor_page),
+    ("Robo Advisor", "robo-advisor", robo_advisor_page),
+    ("Bionic Advisor", "bionic-advisor", bionic_advisor_page),
+    ("Conclusion", "conclusion", conclusion_page),
+    ("Group Activities", "group-activities", group_activities_page),
+]
+
+pages = [(title, url_path, rba.profiled(f"page:{url_path}")(page)) for title, url_path, page in pages]
+
+try:
+    if NAVIGATION_MODE == "tabs":
+        trace.fields["page"] = "tabs"
+        tabs = st.tabs([title for title, _, _ in pages])
+        for tab, (_, _, page) in zip(tabs, pages):
+            with tab:
+                page()
+    else:
+        page = st.navigation(
+            [st.Page(page, title=title, url_path=url_path, default=url_path == START_PAGE)
+             for title, url_path, page in pages],
+            position="top",
+        )
+        trace.fields["page"] = page.url_path
+        page.run()
+finally:
+    rba.finish_trace(trace)
+
+if ADMIN:
+    with st.sidebar.expander("⏱️ Profiling", expanded=True):
+        st.caption(f"Session {session_id} · this rerun {trace.total * 1000:.0f} ms")
+        st.dataframe(rba.trace_frame(trace), hide_index=True)
+        st.markdown("**All sessions, recent reruns**")
+        st.dataframe(rba.span_summary())
+        if RESULT_CACHE_PATH:
+            stats = rba.result_cache(RESULT_CACHE_PATH).stats()
+            st.caption(f"Result cache: {stats['entries']:,} entries, {stats['bytes'] / 2**20:,.1f} MB, "
+                       f"{stats['hits']:,} hits, {stats['preloaded']} preloaded")